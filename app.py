@@ -95,14 +95,27 @@ LANGUAGE_CONFIG = {
 #   - Add version management system
 
 import streamlit as st
+import streamlit.components.v1 as components
 import json
+import orjson
+import base64
+import string
+import traceback
 import warnings
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import subprocess
-import tempfile
 import os
+import io
+import wave
+import ctypes
+import ctypes.util
+import threading
+import functools
+import gc
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Import authentication module
 import app_mysql
@@ -115,6 +128,9 @@ except ImportError:
     def log_api_call(*args, **kwargs):
         pass
 
+# Strips punctuation before comparing/speaking (built once, not on every rerun)
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
 # Environment configuration
 IS_LOCAL_DEV = os.path.exists('./local/bin/run-espeak-ng')  # True if local eSpeak build exists
 
@@ -126,12 +142,31 @@ try:
     import whisper
     import soundfile as sf
     import numpy as np
+    from scipy.signal import resample_poly
     from gtts import gTTS
+    import requests
 except ImportError as e:
     st.error(f"Error: {e}")
     st.error("Please activate the virtual environment and install dependencies")
     st.stop()
 
+# RapidFuzz C implementation of edit distance (optional, falls back to pure Python)
+try:
+    from rapidfuzz.distance import Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Without RapidFuzz, JIT-compile the edit-distance DP with Numba if it's installed
+# (librosa already depends on it)
+NUMBA_AVAILABLE = False
+if not RAPIDFUZZ_AVAILABLE:
+    try:
+        from numba import njit
+        NUMBA_AVAILABLE = True
+    except ImportError:
+        pass
+
 # CCS Testing Framework (optional)
 try:
     from ccs_test_integration import CCSTestSession
@@ -314,23 +349,64 @@ def save_settings(settings: Dict):
         st.error(f"Could not save settings: {e}")
 
 
+# Practice history is shared with streamlit_app.py / streamlit_app_v2.py
+HISTORY_FILE = Path("practice_history.jsonl")  # One session per line, append-only
+LEGACY_HISTORY_FILE = Path("practice_history.json")
+STATS_FILE = Path("practice_stats.json")  # Running totals kept by the other apps
+
+
 def load_history():
     """Load practice history"""
-    history_file = Path("practice_history.json")
-    if history_file.exists():
-        try:
-            with open(history_file) as f:
-                return json.load(f)
-        except Exception:
-            return []
+    try:
+        if not HISTORY_FILE.exists() and LEGACY_HISTORY_FILE.exists():
+            # Convert the old single-list JSON history once
+            history = orjson.loads(LEGACY_HISTORY_FILE.read_bytes())
+            HISTORY_FILE.write_bytes(b"".join(orjson.dumps(s) + b"\n" for s in history))
+            return history
+        if HISTORY_FILE.exists():
+            with open(HISTORY_FILE, 'rb') as f:
+                return [orjson.loads(line) for line in f if line.strip()]
+    except Exception:
+        return []
     return []
 
 
-def save_history(history: List[Dict]):
-    """Save practice history"""
+def session_summary(session: Dict):
+    """(perfect count, average similarity) over a session's practices"""
+    practices = session["practices"]
+    perfect, sim_sum = 0, 0.0
+    for p in practices:  # One pass for both aggregates
+        perfect += bool(p.get("exact_match", p.get("match", False)))
+        sim_sum += p.get("similarity", 0.0)
+    return perfect, sim_sum / len(practices) if practices else 0.0
+
+
+def update_stats_file(session: Dict):
+    """Fold one saved session into practice_stats.json, if the other apps created it"""
+    if not STATS_FILE.exists():
+        return  # They rebuild it from the history when missing
+    stats = orjson.loads(STATS_FILE.read_bytes())
+    count = len(session["practices"])
+    stats["n_sessions"] += 1
+    stats["total_practices"] += count
+    stats["total_perfect"] += session["_perfect"]
+    stats["sum_similarity"] += session["_avg_sim"] * count
+    stats["last_date"] = session["date"]
+    # Replace atomically, so a crash mid-write can't truncate the other apps' totals
+    tmp = STATS_FILE.with_name(f"{STATS_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, STATS_FILE)
+
+
+def save_history(session: Dict):
+    """Append one session to the practice history"""
     try:
-        with open("practice_history.json", 'w') as f:
-            json.dump(history, f, indent=2)
+        # Same line schema as streamlit_app.py / streamlit_app_v2.py: they read
+        # a saved session's totals from these aggregates
+        session["_perfect"], session["_avg_sim"] = session_summary(session)
+        with open(HISTORY_FILE, 'ab') as f:
+            f.write(orjson.dumps(session) + b"\n")
+        update_stats_file(session)
     except Exception as e:
         st.error(f"Could not save history: {e}")
 
@@ -367,44 +443,124 @@ def initialize_session_state():
     if 'audio_input_key' not in st.session_state:
         st.session_state.audio_input_key = 0
     
-    if 'whisper_model' not in st.session_state:
-        st.session_state.whisper_model = None
-        st.session_state.whisper_model_name = None
-    
-    if 'wav2vec2_processor' not in st.session_state:
-        st.session_state.wav2vec2_processor = None
-        st.session_state.wav2vec2_model = None
-    
     # CCS Testing Framework initialization (disabled by default)
     if CCS_AVAILABLE and 'ccs_test' not in st.session_state:
         st.session_state.ccs_test = CCSTestSession(enabled=False)
 
 
+def warm_up_asr_model(model, processor=None):
+    """
+    Run one inference on a second of silence right after loading, so kernel
+    setup and buffer allocation happen behind the loading spinner instead of
+    on the user's first check. Failures are ignored (the model still works).
+    """
+    silence = np.zeros(16000, dtype=np.float32)
+    try:
+        if processor is not None:
+            import torch
+            with torch.no_grad():
+                model(processor(silence, sampling_rate=16000, return_tensors="pt").input_values)
+        elif type(model).__module__.startswith("faster_whisper"):
+            segments, _ = model.transcribe(silence, language="pt", beam_size=1)
+            list(segments)  # Segments are decoded lazily
+        else:
+            model.transcribe(silence, language="pt", temperature=0.0)
+    except Exception:
+        pass
+
+
+@st.cache_resource(show_spinner="Loading Whisper model...")
 def get_whisper_model(model_name: str):
-    """Load or get cached Whisper model"""
-    if st.session_state.whisper_model_name != model_name:
-        with st.spinner(f"Loading Whisper model '{model_name}'..."):
-            st.session_state.whisper_model = whisper.load_model(model_name)
-            st.session_state.whisper_model_name = model_name
-    return st.session_state.whisper_model
+    """
+    Load Whisper model once and share it across all sessions and users
+    
+    Uses faster-whisper (CTranslate2, INT8) when installed - several times faster
+    than openai-whisper's FP32 PyTorch on CPU - and falls back to openai-whisper.
+    """
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        model = whisper.load_model(model_name)
+    else:
+        model = WhisperModel(
+            model_name, device="auto", compute_type="int8",
+            cpu_threads=os.cpu_count() or 0
+        )
+    warm_up_asr_model(model)
+    return model
+
+
+WAV2VEC2_MODEL_NAME = "jonatasgrosman/wav2vec2-large-xlsr-53-portuguese"
+# Written by export_wav2vec2_onnx.py as a build step; point this at a
+# persistent volume on hosts whose local disk is ephemeral
+WAV2VEC2_ONNX_DIR = Path(os.environ.get("WAV2VEC2_ONNX_DIR", "./models/wav2vec2-pt-int8"))
+
+
+def load_wav2vec2_onnx_model():
+    """
+    Load wav2vec2 as an INT8 (dynamically quantized) ONNX Runtime model, or None
+    
+    Only loads an existing export: exporting takes minutes, so it is never
+    done from a user request (run `python3 export_wav2vec2_onnx.py` instead).
+    """
+    quantized_file = "model_quantized.onnx"
+    if not (WAV2VEC2_ONNX_DIR / quantized_file).exists():
+        return None
+    try:
+        from optimum.onnxruntime import ORTModelForCTC
+        return ORTModelForCTC.from_pretrained(
+            WAV2VEC2_ONNX_DIR, file_name=quantized_file, provider="CPUExecutionProvider"
+        )
+    except Exception as e:
+        warnings.warn(f"ONNX Runtime wav2vec2 unavailable, using PyTorch: {e}")
+        return None
+
+
+@st.cache_resource(show_spinner="Loading wav2vec2 Portuguese model (first time may take a few minutes)...")
+def load_wav2vec2_model():
+    """
+    Load the wav2vec2 Portuguese model once and share it across all sessions and users
+    
+    Prefers the INT8 ONNX Runtime model (same forward API, much faster on CPU)
+    and falls back to the FP32 PyTorch model.
+    """
+    import torch
+    from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+    # Containers often start torch with fewer threads than available cores
+    torch.set_num_threads(os.cpu_count() or 1)
+    processor = Wav2Vec2Processor.from_pretrained(WAV2VEC2_MODEL_NAME)
+    model = load_wav2vec2_onnx_model()
+    if model is None:
+        model = Wav2Vec2ForCTC.from_pretrained(WAV2VEC2_MODEL_NAME)
+    warm_up_asr_model(model, processor)
+    return processor, model
 
 
 def get_wav2vec2_model():
-    """Load or get cached wav2vec2 Portuguese model"""
-    if 'wav2vec2_processor' not in st.session_state or st.session_state.wav2vec2_processor is None:
-        try:
-            with st.spinner("Loading wav2vec2 Portuguese model (first time may take a few minutes)..."):
-                from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
-                model_name = "jonatasgrosman/wav2vec2-large-xlsr-53-portuguese"
-                st.session_state.wav2vec2_processor = Wav2Vec2Processor.from_pretrained(model_name)
-                st.session_state.wav2vec2_model = Wav2Vec2ForCTC.from_pretrained(model_name)
-        except ImportError:
-            st.error("wav2vec2 requires 'transformers' and 'torch'. Install with: pip install transformers torch")
-            return None, None
-        except Exception as e:
-            st.error(f"Failed to load wav2vec2 model: {e}")
-            return None, None
-    return st.session_state.wav2vec2_processor, st.session_state.wav2vec2_model
+    """Get the shared wav2vec2 Portuguese model, or (None, None) if it can't be loaded"""
+    try:
+        return load_wav2vec2_model()
+    except ImportError:
+        st.error("wav2vec2 requires 'transformers' and 'torch'. Install with: pip install transformers torch")
+        return None, None
+    except Exception as e:
+        st.error(f"Failed to load wav2vec2 model: {e}")
+        return None, None
+
+
+def free_models():
+    """
+    Drop the shared ASR models (they reload on next use) and return their memory
+    
+    Only the model caches are cleared; other shared resources stay loaded.
+    """
+    get_whisper_model.clear()
+    load_wav2vec2_model.clear()
+    gc.collect()
+    # Only touch torch if a model already imported it
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
 
 
 def get_espeak_path():
@@ -416,8 +572,169 @@ def get_espeak_path():
     return "espeak-ng"
 
 
+# libespeak-ng constants (see src/include/espeak-ng/speak_lib.h)
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+POS_CHARACTER = 1
+espeakRATE = 1
+espeakPITCH = 3
+espeakCHARS_UTF8 = 1
+espeakENDPAUSE = 0x1000
+espeakPHONEMES_IPA = 0x02
+espeakINITIALIZE_DONT_EXIT = 0x8000
+
+_espeak_lib = None
+_espeak_sample_rate = 0
+_espeak_voice = None
+_espeak_lock = threading.Lock()
+_synth_chunks: List[bytes] = []
+
+
+class _EspeakVoice(ctypes.Structure):
+    """espeak_VOICE, used to select a voice by language like `espeak-ng -v` does"""
+    _fields_ = [
+        ("name", ctypes.c_char_p),
+        ("languages", ctypes.c_char_p),
+        ("identifier", ctypes.c_char_p),
+        ("gender", ctypes.c_ubyte),
+        ("age", ctypes.c_ubyte),
+        ("variant", ctypes.c_ubyte),
+        ("xx1", ctypes.c_ubyte),
+        ("score", ctypes.c_int),
+        ("spare", ctypes.c_void_p),
+    ]
+
+
+@ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+def _synth_callback(wav, num_samples, events):
+    """Collect PCM from espeak_Synth (kept at module level so it is never garbage collected)"""
+    if wav and num_samples > 0:
+        _synth_chunks.append(ctypes.string_at(wav, num_samples * 2))
+    return 0  # 0 = continue synthesis
+
+
+def _load_libespeak():
+    """Load libespeak-ng once (local build first, then system-wide), or None"""
+    global _espeak_lib, _espeak_sample_rate
+    if _espeak_lib is not None:
+        return _espeak_lib or None
+
+    candidates = [
+        "./local/lib/libespeak-ng.so.1",
+        "./local/lib/libespeak-ng.dylib",
+        ctypes.util.find_library("espeak-ng"),
+    ]
+    for path in filter(None, candidates):
+        if path.startswith("./") and not Path(path).exists():
+            continue
+        try:
+            lib = ctypes.CDLL(path)
+        except OSError:
+            continue
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        lib.espeak_SetVoiceByProperties.argtypes = [ctypes.POINTER(_EspeakVoice)]
+        lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.espeak_SetSynthCallback.argtypes = [type(_synth_callback)]
+        lib.espeak_Synth.argtypes = [
+            ctypes.c_char_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p
+        ]
+        lib.espeak_TextToPhonemes.argtypes = [ctypes.POINTER(ctypes.c_char_p), ctypes.c_int, ctypes.c_int]
+        lib.espeak_TextToPhonemes.restype = ctypes.c_char_p
+        # Without DONT_EXIT the library calls exit() when espeak-ng-data is
+        # missing; with it, a broken install surfaces as a failed voice selection
+        sample_rate = lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, None, espeakINITIALIZE_DONT_EXIT)
+        if sample_rate > 0:
+            lib.espeak_SetSynthCallback(_synth_callback)
+            _espeak_lib, _espeak_sample_rate = lib, sample_rate
+            return lib
+
+    _espeak_lib = False  # Don't retry on every call
+    return None
+
+
+def _select_voice(lib, voice: str) -> bool:
+    """Switch the library voice only when it changes (caller holds _espeak_lock)"""
+    global _espeak_voice
+    if voice != _espeak_voice:
+        # Voice codes like 'fr-fr' are languages rather than voice names;
+        # fall back to matching by language, as the espeak-ng CLI does
+        if (lib.espeak_SetVoiceByName(voice.encode()) != 0 and
+                lib.espeak_SetVoiceByProperties(ctypes.byref(_EspeakVoice(languages=voice.encode()))) != 0):
+            return False
+        _espeak_voice = voice
+    return True
+
+
+def _text_to_phonemes(text: str, voice: str, *phoneme_modes: int):
+    """
+    Phonemize text in-process with libespeak-ng, once per requested phoneme mode,
+    all under a single voice selection.
+    Returns a list (one string per mode), or None if the library is unavailable
+    so callers can fall back to the CLI.
+    """
+    lib = _load_libespeak()
+    if lib is None:
+        return None
+
+    # The library keeps global translator state, so serialize access
+    with _espeak_lock:
+        if not _select_voice(lib, voice):
+            return None
+
+        results = []
+        for phoneme_mode in phoneme_modes:
+            buffer = ctypes.create_string_buffer(text.encode("utf-8"))
+            text_ptr = ctypes.cast(buffer, ctypes.c_char_p)
+            clauses = []
+            # Each call translates one clause and advances text_ptr (NULL at the end)
+            while text_ptr.value:
+                phonemes = lib.espeak_TextToPhonemes(ctypes.byref(text_ptr), espeakCHARS_UTF8, phoneme_mode)
+                if phonemes:
+                    clauses.append(phonemes.decode("utf-8").strip())
+            results.append(" ".join(c for c in clauses if c))
+        return results
+
+
+def _synthesize_wav(text: str, voice: str, speed: int, pitch: int):
+    """
+    Synthesize text in-process with libespeak-ng and return WAV bytes.
+    Returns None if the library is unavailable so callers can fall back to the CLI.
+    """
+    lib = _load_libespeak()
+    if lib is None:
+        return None
+
+    with _espeak_lock:
+        if not _select_voice(lib, voice):
+            return None
+        lib.espeak_SetParameter(espeakRATE, speed, 0)
+        lib.espeak_SetParameter(espeakPITCH, pitch, 0)
+
+        _synth_chunks.clear()
+        data = text.encode("utf-8")
+        # AUDIO_OUTPUT_SYNCHRONOUS: returns once all audio went through the callback
+        if lib.espeak_Synth(data, len(data) + 1, 0, POS_CHARACTER, 0,
+                            espeakCHARS_UTF8 | espeakENDPAUSE, None, None) != 0:
+            return None
+        pcm = b"".join(_synth_chunks)
+        _synth_chunks.clear()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(_espeak_sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+@st.cache_data(max_entries=2048, show_spinner=False)
 def get_phonemes(text: str, voice: str = "pt-br") -> str:
     """Get eSpeak phoneme codes (eIPA) for text"""
+    phonemes = _text_to_phonemes(text, voice, 0)
+    if phonemes is not None:
+        return phonemes[0]
     try:
         result = subprocess.run(
             [get_espeak_path(), "-v", voice, "-x", "-q", text],
@@ -430,8 +747,12 @@ def get_phonemes(text: str, voice: str = "pt-br") -> str:
         return "[phonemes unavailable]"
 
 
+@st.cache_data(max_entries=2048, show_spinner=False)
 def get_ipa(text: str, voice: str = "pt-br") -> str:
     """Get IPA transcription for text"""
+    ipa = _text_to_phonemes(text, voice, espeakPHONEMES_IPA)
+    if ipa is not None:
+        return ipa[0]
     try:
         result = subprocess.run(
             [get_espeak_path(), "-v", voice, "--ipa", "-q", text],
@@ -444,6 +765,60 @@ def get_ipa(text: str, voice: str = "pt-br") -> str:
         return "[IPA unavailable]"
 
 
+@st.cache_data(max_entries=4096, show_spinner=False)
+def get_phonemes_and_ipa(text: str, voice: str = "pt-br") -> Tuple[str, str]:
+    """Get (eIPA, IPA) for text with one voice selection instead of two separate lookups"""
+    both = _text_to_phonemes(text, voice, 0, espeakPHONEMES_IPA)
+    if both is not None:
+        return both[0], both[1]
+    # CLI fallback: espeak-ng prints one format per run, so run both processes at once
+    try:
+        processes = [
+            subprocess.Popen(
+                [get_espeak_path(), "-v", voice, flag, "-q", text],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            for flag in ("-x", "--ipa")
+        ]
+    except FileNotFoundError:
+        return "[phonemes unavailable]", "[IPA unavailable]"
+    outputs = []
+    for process, unavailable in zip(processes, ("[phonemes unavailable]", "[IPA unavailable]")):
+        stdout, _ = process.communicate()
+        outputs.append(stdout.strip() if process.returncode == 0 else unavailable)
+    return outputs[0], outputs[1]
+
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """
+    One worker pool shared by all sessions for background espeak calls
+    (cached so script reruns don't spawn a new pool each time)
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="practice")
+
+
+def prefetch_target(text: str, voice: str):
+    """
+    Start the target's (eIPA, IPA) lookup in the background as soon as the
+    phrase is shown, so it is ready (and cached) by the time the user checks.
+    Runs once per (text, voice); the future is kept in session state.
+    """
+    prefetch = st.session_state.get('target_prefetch')
+    artifacts = prefetch and prefetch['key'] == (text, voice) and prefetch['artifacts']
+    # Resubmit a lookup that failed so the next rerun retries it instead of
+    # re-raising the stored exception
+    if not artifacts or (artifacts.done() and (artifacts.cancelled() or artifacts.exception() is not None)):
+        prefetch = {
+            'key': (text, voice),
+            'artifacts': get_executor().submit(get_phonemes_and_ipa, text, voice),
+        }
+        st.session_state.target_prefetch = prefetch
+    return prefetch
+
+
 def speak_text(text: str, voice: str = "pt-br", speed: int = 160, pitch: int = 40) -> tuple[bytes, str]:
     """
     Generate speech using eSpeak NG (returns audio bytes, does not auto-play)
@@ -458,15 +833,18 @@ def speak_text(text: str, voice: str = "pt-br", speed: int = 160, pitch: int = 4
         (audio_bytes, format) where format is 'audio/wav'
     """
     try:
-        # Use --stdout to capture audio bytes instead of playing directly
-        result = subprocess.run([
-            get_espeak_path(),
-            "-v", voice,
-            "-s", str(speed),
-            "-p", str(pitch),
-            "--stdout",  # Output WAV to stdout instead of playing
-            text
-        ], capture_output=True, check=True)
+        # Synthesize in-process when libespeak-ng is available
+        audio_bytes = _synthesize_wav(text, voice, speed, pitch)
+        if audio_bytes is None:
+            # Use --stdout to capture audio bytes instead of playing directly
+            audio_bytes = subprocess.run([
+                get_espeak_path(),
+                "-v", voice,
+                "-s", str(speed),
+                "-p", str(pitch),
+                "--stdout",  # Output WAV to stdout instead of playing
+                text
+            ], capture_output=True, check=True).stdout
         
         # Log API call (eSpeak is free/local but good to track usage)
         log_api_call(
@@ -474,12 +852,12 @@ def speak_text(text: str, voice: str = "pt-br", speed: int = 160, pitch: int = 4
             text=text,
             language=voice,
             char_count=len(text),
-            audio_bytes=len(result.stdout),
+            audio_bytes=len(audio_bytes),
             success=True,
             cached=False
         )
         
-        return result.stdout, 'audio/wav'
+        return audio_bytes, 'audio/wav'
     except (subprocess.CalledProcessError, FileNotFoundError):
         # Return empty audio if espeak not available
         return b'', 'audio/wav'
@@ -506,10 +884,6 @@ def speak_text_google_cloud(text: str, lang: str = "pt-BR", use_wav: bool = Fals
     Returns:
         (audio_bytes, format) where format is 'audio/mp3' or 'audio/wav'
     """
-    import requests
-    import json
-    import base64
-    
     # Get API key from secrets
     try:
         api_key = st.secrets["google_cloud_tts_api_key"]
@@ -576,7 +950,7 @@ def speak_text_google_cloud(text: str, lang: str = "pt-BR", use_wav: bool = Fals
     return audio_bytes, format_str
 
 
-@st.cache_data(ttl=86400)  # Cache for 24 hours (shared across all users!)
+@st.cache_data(ttl=86400, max_entries=256, show_spinner=False)  # Cache for 24 hours (shared across all users!)
 def speak_text_gtts(text: str, lang: str = "pt-br", use_wav: bool = False, slow: bool = False) -> tuple[bytes, str]:
     """
     Generate speech using Google TTS (higher quality than eSpeak)
@@ -598,53 +972,46 @@ def speak_text_gtts(text: str, lang: str = "pt-br", use_wav: bool = False, slow:
     # or 'pt-br' specifically for Brazilian Portuguese
     tts = gTTS(text=text, lang=lang.replace('-br', ''), slow=slow)
     
-    # Save to temporary file and read back
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-        mp3_path = fp.name
-        tts.save(mp3_path)
+    # Render into memory instead of a temp file
+    buffer = io.BytesIO()
+    tts.write_to_fp(buffer)
+    mp3_bytes = buffer.getvalue()
+    
+    if use_wav:
+        # Convert MP3 to WAV for iOS Safari compatibility: ffmpeg decodes the
+        # piped MP3 to raw PCM and the WAV header is written here, since ffmpeg
+        # can't fill in the RIFF sizes when its output is a pipe
+        result = subprocess.run(
+            ['ffmpeg', '-i', 'pipe:0', '-f', 's16le', '-acodec', 'pcm_s16le',
+             '-ac', '1', '-ar', '22050', 'pipe:1'],
+            input=mp3_bytes,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL  # communicate() drains stdout, so no pipe deadlock
+        )
         
-        if use_wav:
-            # Convert MP3 to WAV for iOS Safari compatibility
-            wav_path = mp3_path.replace('.mp3', '.wav')
-            
-            # Run ffmpeg without capturing output to avoid pipe buffer deadlock
-            result = subprocess.run(
-                ['ffmpeg', '-i', mp3_path, '-acodec', 'pcm_s16le', 
-                 '-ar', '22050', '-y', wav_path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            
-            if result.returncode == 0:
-                with open(wav_path, 'rb') as audio_file:
-                    audio_bytes = audio_file.read()
-                Path(wav_path).unlink()  # Clean up WAV
-                Path(mp3_path).unlink()  # Clean up MP3
-                return audio_bytes, 'audio/wav'
-            else:
-                # Conversion failed, fall back to MP3
-                with open(mp3_path, 'rb') as audio_file:
-                    audio_bytes = audio_file.read()
-                Path(mp3_path).unlink()
-                return audio_bytes, 'audio/mp3'
-        else:
-            # Return MP3
-            with open(mp3_path, 'rb') as audio_file:
-                audio_bytes = audio_file.read()
-            Path(mp3_path).unlink()  # Clean up temp file
-            
-            # Log API call for cost tracking
-            log_api_call(
-                api_type="gtts",
-                text=text,
-                language=lang,
-                char_count=len(text),
-                audio_bytes=len(audio_bytes),
-                success=True,
-                cached=False
-            )
-            
-            return audio_bytes, 'audio/mp3'
+        if result.returncode == 0:
+            wav_buffer = io.BytesIO()
+            with wave.open(wav_buffer, 'wb') as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(22050)
+                wav_file.writeframes(result.stdout)
+            return wav_buffer.getvalue(), 'audio/wav'
+        # Conversion failed, fall back to MP3
+        return mp3_bytes, 'audio/mp3'
+    
+    # Log API call for cost tracking
+    log_api_call(
+        api_type="gtts",
+        text=text,
+        language=lang,
+        char_count=len(text),
+        audio_bytes=len(mp3_bytes),
+        success=True,
+        cached=False
+    )
+    
+    return mp3_bytes, 'audio/mp3'
 
 
 def generate_target_audio(text: str, settings: Dict) -> tuple[bytes, str]:
@@ -659,8 +1026,7 @@ def generate_target_audio(text: str, settings: Dict) -> tuple[bytes, str]:
         (audio_bytes, format) where format is 'audio/mp3', 'audio/wav', or 'audio/x-wav'
     """
     # Remove punctuation to avoid comma/pause detection affecting scores
-    import string
-    text_no_punct = text.translate(str.maketrans('', '', string.punctuation))
+    text_no_punct = text.translate(PUNCTUATION_TABLE)
     
     tts_engine = settings.get('tts_engine', 'google_cloud')  # Default to Google Cloud TTS
     
@@ -731,55 +1097,66 @@ def generate_target_audio(text: str, settings: Dict) -> tuple[bytes, str]:
             )
 
 
-def transcribe_audio_whisper(audio_file: str, model, language_code: str = "pt"):
+def transcribe_audio_whisper(audio: np.ndarray, model, language_code: str = "pt"):
     """
     Transcribe audio to text using Whisper
     
     Args:
-        audio_file: Path to audio file
-        model: Whisper model instance
+        audio: float32 mono samples at 16kHz (Whisper's native input format)
+        model: faster-whisper or openai-whisper model instance
         language_code: Whisper language code (e.g., 'pt', 'fr', 'nl')
     
     Note: No initial_prompt is used to avoid biasing the transcription.
     We force language detection and use low temperature for consistency.
     """
-    result = model.transcribe(
-        audio=audio_file,
-        language=language_code,  # Force language (ISO 639-1 code)
-        task="transcribe",
-        temperature=0.0,  # Deterministic output
-        no_speech_threshold=0.6,  # Higher threshold to reject non-speech (like beeps)
-        logprob_threshold=-1.0,   # Stricter on low-confidence segments
-        condition_on_previous_text=False,  # Don't use context from previous segments
-        word_timestamps=False,  # Disable word-level timestamps to reduce space insertion
-        compression_ratio_threshold=2.4  # Default is 2.4, keep it strict
-    )
+    if type(model).__module__.startswith("faster_whisper"):
+        segments, info = model.transcribe(
+            audio,
+            language=language_code,
+            task="transcribe",
+            beam_size=1,  # Greedy decoding, same as openai-whisper at temperature 0
+            temperature=0.0,
+            no_speech_threshold=0.6,
+            log_prob_threshold=-1.0,
+            condition_on_previous_text=False,
+            word_timestamps=False,
+            without_timestamps=True,  # Short clips: skip timestamp tokens in the decoder
+            compression_ratio_threshold=2.4,
+            vad_filter=True,  # Silero VAD drops leftover silence/noise before decoding
+            vad_parameters=dict(min_silence_duration_ms=300)
+        )
+        text = "".join(segment.text for segment in segments)
+        result = {"text": text, "language": info.language}
+    else:
+        result = model.transcribe(
+            audio=audio,
+            language=language_code,  # Force language (ISO 639-1 code)
+            task="transcribe",
+            temperature=0.0,  # Deterministic output
+            no_speech_threshold=0.6,  # Higher threshold to reject non-speech (like beeps)
+            logprob_threshold=-1.0,   # Stricter on low-confidence segments
+            condition_on_previous_text=False,  # Don't use context from previous segments
+            word_timestamps=False,  # Disable word-level timestamps to reduce space insertion
+            compression_ratio_threshold=2.4  # Default is 2.4, keep it strict
+        )
     
     # Double-check detected language (Whisper should respect language parameter but doesn't always)
     detected_lang = result.get("language", "unknown")
     if detected_lang != language_code:
         # Log warning but continue (the transcription might still be correct)
-        import warnings
         warnings.warn(f"Whisper detected language '{detected_lang}' instead of '{language_code}'")
     
     return result["text"].strip().lower()
 
 
-def transcribe_audio_wav2vec2(audio_file: str, processor, model):
+def transcribe_audio_wav2vec2(speech: np.ndarray, processor, model):
     """
     Transcribe audio to text using wav2vec2 Portuguese model
+    
+    speech: float32 mono samples at 16kHz (what wav2vec2 expects)
     """
     try:
         import torch
-        import soundfile as sf
-        
-        # Load audio
-        speech, sample_rate = sf.read(audio_file)
-        
-        # Resample if needed (wav2vec2 expects 16kHz)
-        if sample_rate != 16000:
-            import librosa
-            speech = librosa.resample(speech, orig_sr=sample_rate, target_sr=16000)
         
         # Process
         inputs = processor(speech, sampling_rate=16000, return_tensors="pt", padding=True)
@@ -787,8 +1164,9 @@ def transcribe_audio_wav2vec2(audio_file: str, processor, model):
         with torch.no_grad():
             logits = model(inputs.input_values).logits
         
-        predicted_ids = torch.argmax(logits, dim=-1)
-        transcription = processor.batch_decode(predicted_ids)[0]
+        # Greedy CTC: argmax in numpy, then decode the single sequence directly
+        predicted_ids = logits[0].cpu().numpy().argmax(axis=-1)
+        transcription = processor.tokenizer.decode(predicted_ids.tolist())
         
         return transcription.strip().lower()
         
@@ -797,12 +1175,12 @@ def transcribe_audio_wav2vec2(audio_file: str, processor, model):
         return ""
 
 
-def transcribe_audio(audio_file: str, settings: Dict, language: str = "Portuguese"):
+def transcribe_audio(audio: np.ndarray, settings: Dict, language: str = "Portuguese"):
     """
     Transcribe audio using the selected ASR engine
     
     Args:
-        audio_file: Path to audio file
+        audio: float32 mono samples at 16kHz
         settings: App settings dict
         language: Selected language name (e.g., "Portuguese", "French")
     """
@@ -823,12 +1201,12 @@ def transcribe_audio(audio_file: str, settings: Dict, language: str = "Portugues
                 st.warning("wav2vec2 unavailable, falling back to Whisper")
                 asr_engine = 'whisper'
             else:
-                return transcribe_audio_wav2vec2(audio_file, processor, model)
+                return transcribe_audio_wav2vec2(audio, processor, model)
     
     # Default to Whisper
     model_size = settings.get('whisper_model_size', 'base')
     model = get_whisper_model(model_size)
-    return transcribe_audio_whisper(audio_file, model, whisper_code)
+    return transcribe_audio_whisper(audio, model, whisper_code)
 
 
 def levenshtein_distance(s1: str, s2: str) -> int:
@@ -836,24 +1214,105 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     Calculate Levenshtein (edit) distance between two strings.
     Returns the minimum number of single-character edits (insertions, deletions, substitutions).
     """
+    if RAPIDFUZZ_AVAILABLE:
+        return Levenshtein.distance(s1, s2)
+    
+    # Keep the shorter string as s2 so the rows are as small as possible
     if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
+        s1, s2 = s2, s1
     
-    if len(s2) == 0:
+    n = len(s2)
+    if n == 0:
         return len(s1)
+    if n <= 64:
+        # Phoneme strings are short: one machine word holds a whole DP column
+        return _myers_distance(s1, s2)
     
-    previous_row = range(len(s2) + 1)
+    # Two preallocated rows, swapped after each pass instead of reallocated
+    previous_row = list(range(n + 1))
+    current_row = [0] * (n + 1)
     for i, c1 in enumerate(s1):
-        current_row = [i + 1]
+        current_row[0] = i + 1
         for j, c2 in enumerate(s2):
             # Cost of insertions, deletions, or substitutions
             insertions = previous_row[j + 1] + 1
             deletions = current_row[j] + 1
             substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
+            current_row[j + 1] = min(insertions, deletions, substitutions)
+        previous_row, current_row = current_row, previous_row
     
-    return previous_row[-1]
+    return previous_row[n]
+
+
+def _myers_distance(text: str, pattern: str) -> int:
+    """
+    Levenshtein distance via Myers' (1999) bit-parallel algorithm.
+    
+    Each DP column is kept as vertical +1/-1 delta bitmasks over pattern
+    positions, so a whole column advances with a handful of bitwise ops per
+    character of text instead of len(pattern) cell updates.
+    """
+    m = len(pattern)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    
+    # peq[c]: bitmask of the positions where c occurs in pattern
+    peq = {}
+    for i, c in enumerate(pattern):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    
+    pv, mv, score = mask, 0, m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def _dp_fill(a, b):
+    """
+    Fill the Levenshtein DP table for two code-point arrays.
+    JIT-compiled with Numba when available (see NUMBA_AVAILABLE).
+    """
+    m, n = len(a), len(b)
+    dp = np.empty((m + 1, n + 1), dtype=np.int32)
+    for i in range(m + 1):
+        dp[i, 0] = i
+    for j in range(n + 1):
+        dp[0, j] = j
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if a[i-1] == b[j-1]:
+                dp[i, j] = dp[i-1, j-1]
+            else:
+                dp[i, j] = 1 + min(dp[i-1, j], dp[i, j-1], dp[i-1, j-1])
+    return dp
+
+
+if NUMBA_AVAILABLE:
+    _dp_fill = njit(cache=True, boundscheck=False)(_dp_fill)
+
+
+def _code_points(s: str) -> np.ndarray:
+    """String as a contiguous uint32 array of code points (IPA is not single-byte)"""
+    return np.frombuffer(s.encode('utf-32-le'), dtype=np.uint32)
+
+
+@st.cache_resource
+def warm_up_edit_distance_jit():
+    """Compile _dp_fill at startup so the first scored attempt doesn't pay for it"""
+    if NUMBA_AVAILABLE:
+        _dp_fill(_code_points("a"), _code_points("b"))
 
 
 def get_edit_operations(s1: str, s2: str):
@@ -862,25 +1321,42 @@ def get_edit_operations(s1: str, s2: str):
     Returns a list of tuples: (operation, position, char1, char2)
     where operation is 'match', 'substitute', 'insert', or 'delete'
     """
+    if RAPIDFUZZ_AVAILABLE:
+        # Expand RapidFuzz's alignment blocks into per-character operations
+        operations = []
+        for tag, i1, i2, j1, j2 in Levenshtein.opcodes(s1, s2):
+            if tag == 'equal':
+                operations.extend(('match', i1 + k, s1[i1 + k], s2[j1 + k]) for k in range(i2 - i1))
+            elif tag == 'replace':
+                operations.extend(('substitute', i1 + k, s1[i1 + k], s2[j1 + k]) for k in range(i2 - i1))
+            elif tag == 'insert':
+                operations.extend(('insert', i1, '-', s2[j]) for j in range(j1, j2))
+            elif tag == 'delete':
+                operations.extend(('delete', i, s1[i], '-') for i in range(i1, i2))
+        return operations
+    
     # Build the DP table
     m, n = len(s1), len(s2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
-    
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if s1[i-1] == s2[j-1]:
-                dp[i][j] = dp[i-1][j-1]
-            else:
-                dp[i][j] = 1 + min(
-                    dp[i-1][j],    # delete
-                    dp[i][j-1],    # insert
-                    dp[i-1][j-1]   # substitute
-                )
+    if NUMBA_AVAILABLE:
+        dp = _dp_fill(_code_points(s1), _code_points(s2)).tolist()
+    else:
+        dp = [[0] * (n + 1) for _ in range(m + 1)]
+        
+        for i in range(m + 1):
+            dp[i][0] = i
+        for j in range(n + 1):
+            dp[0][j] = j
+        
+        for i in range(1, m + 1):
+            for j in range(1, n + 1):
+                if s1[i-1] == s2[j-1]:
+                    dp[i][j] = dp[i-1][j-1]
+                else:
+                    dp[i][j] = 1 + min(
+                        dp[i-1][j],    # delete
+                        dp[i][j-1],    # insert
+                        dp[i-1][j-1]   # substitute
+                    )
     
     # Backtrack to find operations
     operations = []
@@ -924,6 +1400,7 @@ def compare_phonemes_positional(user_phonemes: str, correct_phonemes: str):
     return exact_match, similarity
 
 
+@functools.lru_cache(maxsize=1024)
 def compare_phonemes_edit_distance(user_phonemes: str, correct_phonemes: str):
     """
     Compare phonemes using edit distance (Levenshtein).
@@ -938,6 +1415,8 @@ def compare_phonemes_edit_distance(user_phonemes: str, correct_phonemes: str):
     
     if len(correct_phonemes) == 0:
         return exact_match, 0.0, len(user_phonemes)
+    if exact_match:
+        return True, 1.0, 0  # Perfect pronunciation: no need to run the DP
     
     distance = levenshtein_distance(user_phonemes, correct_phonemes)
     max_length = max(len(user_phonemes), len(correct_phonemes))
@@ -982,23 +1461,29 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
     4. This allows flexible matching while maintaining proper IPA display
     """
     try:
-        # Save audio bytes to temporary file
-        temp_audio = "temp_streamlit_recording.wav"
-        with open(temp_audio, 'wb') as f:
-            f.write(audio_bytes)
+        # Decode the recording in memory as float32 mono
+        audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype='float32')
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1)
+        
+        # Resample to 16kHz up front (what Whisper and wav2vec2 expect) so
+        # trimming runs on a third of the samples of a 44.1/48kHz recording
+        if sample_rate != 16000:
+            audio_data = resample_poly(audio_data, 16000, sample_rate).astype(np.float32)
+            sample_rate = 16000
         
         # Preprocess audio: trim silence/noise from start and end
         # This helps remove system noise and other artifacts
+        trimmed_audio_bytes = audio_bytes
         try:
-            audio_data, sample_rate = sf.read(temp_audio)
-            
             # Simple energy-based trimming
             # Calculate short-term energy
+            # Frames are a reshaped view of the buffer, so the energy of every
+            # frame comes out of a single einsum pass
             frame_length = int(0.02 * sample_rate)  # 20ms frames
-            energy = np.array([
-                np.sum(audio_data[i:i+frame_length]**2) 
-                for i in range(0, len(audio_data) - frame_length, frame_length)
-            ])
+            n_frames = max(0, (len(audio_data) - 1) // frame_length)
+            frames = audio_data[:n_frames * frame_length].reshape(n_frames, frame_length)
+            energy = np.einsum('ij,ij->i', frames, frames, dtype=np.float32)
             
             # Find speech boundaries using user-configurable threshold
             # threshold is a percentage of max energy (default 0.01 = 1%)
@@ -1014,32 +1499,27 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
                 start_sample = max(0, speech_frames[0] * frame_length - padding_samples)
                 end_sample = min(len(audio_data), (speech_frames[-1] + 1) * frame_length + padding_samples)
                 
-                trimmed_audio = audio_data[start_sample:end_sample]
+                audio_data = audio_data[start_sample:end_sample]
                 
-                # Save trimmed audio
-                sf.write(temp_audio, trimmed_audio, sample_rate)
-                
-                # Also save trimmed audio bytes for playback
-                import io
+                # Keep trimmed audio bytes for playback
                 trimmed_buffer = io.BytesIO()
-                sf.write(trimmed_buffer, trimmed_audio, sample_rate, format='WAV')
+                sf.write(trimmed_buffer, audio_data, sample_rate, format='WAV', subtype='PCM_16')
                 trimmed_audio_bytes = trimmed_buffer.getvalue()
-            else:
-                trimmed_audio_bytes = audio_bytes
         except Exception as e:
             # If trimming fails, continue with original audio
             pass
         
-        # Get correct pronunciation
-        correct_phonemes = get_phonemes(text, settings['voice'])
-        correct_ipa = get_ipa(text, settings['voice'])
+        # Get correct pronunciation in the background while the ASR model runs
+        # (ASR stays on this thread since it may show Streamlit warnings);
+        # usually already done since the phrase was first shown
+        target_future = prefetch_target(text, settings['voice'])['artifacts']
         
         # Transcribe user's audio using selected ASR engine
-        recognized_text = transcribe_audio(temp_audio, settings, st.session_state.language)
+        recognized_text = transcribe_audio(audio_data, settings, st.session_state.language)
+        correct_phonemes, correct_ipa = target_future.result()
         
         # Get phonemes with proper spacing (for display)
-        user_phonemes = get_phonemes(recognized_text, settings['voice'])
-        user_ipa = get_ipa(recognized_text, settings['voice'])
+        user_phonemes, user_ipa = get_phonemes_and_ipa(recognized_text, settings['voice'])
         
         # For comparison: normalize by removing spaces from PHONEMES, not text
         # This allows flexible matching while preserving word boundaries in display
@@ -1055,9 +1535,6 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
             algorithm=algorithm
         )
         
-        # Keep the original recording for playback
-        # (Don't delete temp_audio - we'll save it in the result)
-        
         result = {
             "target": text,
             "recognized": recognized_text,
@@ -1104,7 +1581,6 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
         
     except Exception as e:
         st.error(f"Error during practice: {e}")
-        import traceback
         st.error(traceback.format_exc())
         return None
 
@@ -1114,7 +1590,7 @@ def save_current_session():
     current_session = st.session_state.current_sessions[st.session_state.language]
     if current_session["practices"]:
         st.session_state.history.append(current_session)
-        save_history(st.session_state.history)
+        save_history(current_session)
         
         # Reset current session for this language
         st.session_state.current_sessions[st.session_state.language] = {
@@ -1131,6 +1607,7 @@ def save_current_session():
 def main():
     """Main Streamlit app"""
     initialize_session_state()
+    warm_up_edit_distance_jit()
     
     # Header - Dynamic title based on selected language
     lang_config = LANGUAGE_CONFIG[st.session_state.language]
@@ -1259,6 +1736,12 @@ def main():
         else:
             st.caption("Using wav2vec2-large-xlsr-53-portuguese")
         
+        # Models are shared by every session in the process, so only offer
+        # unloading them on a single-user local build
+        if IS_LOCAL_DEV and st.button("🧹 Free Models", help="Unload the speech recognition models to free memory. They reload on the next check."):
+            free_models()
+            st.success("Models unloaded")
+        
         st.session_state.settings['comparison_algorithm'] = st.selectbox(
             "Scoring Algorithm",
             ["edit_distance", "positional"],
@@ -1643,6 +2126,8 @@ def main():
             text = st.text_input("Enter word or phrase:", key="practice_text_free")
         
         if text:
+            prefetch_target(text, st.session_state.settings['voice'])
+            
             # Show target audio directly - one click to play
             st.write("🎯 **Target pronunciation:**")
             with st.spinner("Generating audio..."):
@@ -1691,8 +2176,6 @@ def main():
             result = st.session_state.last_result
             
             # Play celebration sounds based on score (only once per result)
-            import streamlit.components.v1 as components
-            
             # Track if sound has been played for this result
             result_id = f"{result.get('target', '')}_{result.get('recognized', '')}_{result.get('similarity', 0)}"
             if 'last_sound_played' not in st.session_state:
@@ -1778,9 +2261,8 @@ def main():
                 
                 # Show comparison note
                 # Normalize text by removing punctuation for comparison
-                import string
-                target_clean = result['target'].lower().translate(str.maketrans('', '', string.punctuation))
-                recognized_clean = result['recognized'].translate(str.maketrans('', '', string.punctuation))
+                target_clean = result['target'].lower().translate(PUNCTUATION_TABLE)
+                recognized_clean = result['recognized'].translate(PUNCTUATION_TABLE)
                 
                 correct_phonemes_no_space = result['correct_phonemes'].replace(" ", "")
                 user_phonemes_no_space = result['user_phonemes'].replace(" ", "")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+export_wav2vec2_onnx.py - Export the wav2vec2 Portuguese model to INT8 ONNX
+
+app.py loads the quantized model from ./models/wav2vec2-pt-int8 (or from
+$WAV2VEC2_ONNX_DIR) when it exists and otherwise uses the PyTorch model.
+Exporting takes minutes and a lot of memory, so run it once as a build step
+on the machine type the app is deployed to, not from a user request.
+
+Usage:
+    # Export for this machine's CPU
+    python3 export_wav2vec2_onnx.py
+
+    # Export for another CPU (e.g. building for an AVX2-only server)
+    python3 export_wav2vec2_onnx.py --target avx2 -o /data/wav2vec2-pt-int8
+"""
+
+import argparse
+import os
+import platform
+import sys
+from pathlib import Path
+
+WAV2VEC2_MODEL_NAME = "jonatasgrosman/wav2vec2-large-xlsr-53-portuguese"
+WAV2VEC2_ONNX_DIR = Path(os.environ.get("WAV2VEC2_ONNX_DIR", "./models/wav2vec2-pt-int8"))
+QUANTIZED_FILE = "model_quantized.onnx"
+TARGETS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+def detect_target():
+    """Pick the quantization target the current CPU supports"""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    flags = set()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    break
+    except OSError:
+        pass  # Not Linux: assume the AVX2 baseline of any recent x86-64
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
+
+def export(save_dir=WAV2VEC2_ONNX_DIR, target=None):
+    """Export and dynamically quantize the model into save_dir"""
+    from optimum.onnxruntime import ORTModelForCTC, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    target = target or detect_target()
+    config = getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=False)
+    print(f"📦 Exporting {WAV2VEC2_MODEL_NAME} ({target}) to: {save_dir}")
+    exported = ORTModelForCTC.from_pretrained(WAV2VEC2_MODEL_NAME, export=True)
+    ORTQuantizer.from_pretrained(exported).quantize(save_dir=save_dir, quantization_config=config)
+    print(f"✓ Saved {Path(save_dir) / QUANTIZED_FILE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export the wav2vec2 Portuguese model to INT8 ONNX for app.py'
+    )
+    parser.add_argument('-o', '--output', type=Path, default=WAV2VEC2_ONNX_DIR,
+                        help=f'Output directory (default: {WAV2VEC2_ONNX_DIR})')
+    parser.add_argument('--target', choices=TARGETS,
+                        help='CPU to quantize for (default: detected from this machine)')
+
+    args = parser.parse_args()
+
+    try:
+        export(args.output, args.target)
+    except ImportError as e:
+        print(f"Error: {e}")
+        print("\nInstall the optional dependencies:")
+        print("  pip install -r requirements-wav2vec2.txt")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        print("app.py will keep using the PyTorch model.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -22,8 +22,9 @@ import argparse
 import subprocess
 import sys
 import warnings
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Callable, Optional, Dict, List, Tuple, Union
 
 # Suppress FP16 warning from Whisper on CPU
 warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
@@ -40,6 +41,36 @@ except ImportError as e:
     print("  pip install -r requirements.txt")
     sys.exit(1)
 
+# faster-whisper (CTranslate2) backend is optional
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+
+@lru_cache(maxsize=8192)
+def phoneme_similarity(user_phonemes: str, correct_phonemes: str) -> Tuple[bool, float]:
+    """
+    Compare two phoneme strings; memoized since attempts repeat often
+    
+    Returns:
+        Tuple of (exact_match, similarity_score)
+    """
+    exact_match = user_phonemes == correct_phonemes
+    
+    # Simple similarity: character-level matching
+    if len(correct_phonemes) == 0:
+        similarity = 0.0
+    else:
+        matches = sum(
+            1 for a, b in zip(user_phonemes, correct_phonemes)
+            if a == b
+        )
+        similarity = matches / max(len(user_phonemes), len(correct_phonemes))
+    
+    return exact_match, similarity
+
 
 class PronunciationTrainer:
     """Brazilian Portuguese pronunciation trainer with speech recognition"""
@@ -48,7 +79,9 @@ class PronunciationTrainer:
         self,
         espeak_path: str = "./local/bin/run-espeak-ng",
         whisper_model: str = "base",
-        voice: str = "pt-br"
+        voice: str = "pt-br",
+        backend: str = "openai-whisper",
+        compute_type: str = "auto"
     ):
         """
         Initialize the pronunciation trainer
@@ -57,12 +90,26 @@ class PronunciationTrainer:
             espeak_path: Path to eSpeak executable
             whisper_model: Whisper model size (tiny, base, small, medium, large)
             voice: eSpeak voice (pt-br for Brazilian, pt for European)
+            backend: "openai-whisper" or "faster-whisper" (CTranslate2)
+            compute_type: faster-whisper compute type; "auto" picks int8 on
+                CPU and float16 on GPU
         """
         self.espeak = Path(espeak_path)
         self.voice = voice
         
-        print(f"Loading Whisper model '{whisper_model}'...")
-        self.whisper = whisper.load_model(whisper_model)
+        if backend == "faster-whisper" and not FASTER_WHISPER_AVAILABLE:
+            print("Warning: faster-whisper not installed, using openai-whisper")
+            backend = "openai-whisper"
+        self.backend = backend
+        
+        print(f"Loading Whisper model '{whisper_model}' ({backend})...")
+        if backend == "faster-whisper":
+            if compute_type == "auto":
+                import ctranslate2
+                compute_type = "float16" if ctranslate2.get_cuda_device_count() else "int8"
+            self.whisper = WhisperModel(whisper_model, device="auto", compute_type=compute_type)
+        else:
+            self.whisper = whisper.load_model(whisper_model)
         print("✓ Whisper model loaded\n")
         
         if not self.espeak.exists():
@@ -73,8 +120,9 @@ class PronunciationTrainer:
         self,
         duration: int = 3,
         samplerate: int = 16000,
-        output_file: Optional[str] = None
-    ) -> str:
+        output_file: Optional[str] = None,
+        out: Optional[np.ndarray] = None
+    ) -> Optional[str]:
         """
         Record audio from microphone
         
@@ -82,23 +130,34 @@ class PronunciationTrainer:
             duration: Recording duration in seconds
             samplerate: Sample rate (Whisper uses 16kHz)
             output_file: Optional output file path
+            out: Optional preallocated float32 buffer of shape (frames, 1)
+                to record into, reused across calls; its length sets the
+                duration and no file is written
             
         Returns:
-            Path to recorded audio file
+            Path to recorded audio file, or None when recording into `out`
         """
+        if out is not None:
+            duration = len(out) / samplerate
         print(f"\n🎤 Recording for {duration} seconds...")
         print("Speak now!")
         
-        recording = sd.rec(
-            int(duration * samplerate),
-            samplerate=samplerate,
-            channels=1,
-            dtype='float32'
-        )
+        if out is not None:
+            sd.rec(samplerate=samplerate, channels=1, out=out)
+        else:
+            recording = sd.rec(
+                int(duration * samplerate),
+                samplerate=samplerate,
+                channels=1,
+                dtype='float32'
+            )
         sd.wait()
         
         print("✓ Recording complete\n")
         
+        if out is not None:
+            return None  # The samples are in `out`; transcribe_audio takes arrays
+        
         if output_file is None:
             output_file = "temp_recording.wav"
         
@@ -107,17 +166,21 @@ class PronunciationTrainer:
     
     def transcribe_audio(
         self, 
-        audio_file: str,
+        audio_file: Union[str, np.ndarray],
         prompt: Optional[str] = None,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        on_segment: Optional[Callable[[str], None]] = None
     ) -> Tuple[str, Dict]:
         """
         Transcribe audio to text using Whisper
         
         Args:
-            audio_file: Path to audio file
+            audio_file: Path to audio file, or 16 kHz mono float32 samples
             prompt: Optional hint text to guide recognition (helps reduce hallucinations)
             temperature: Sampling temperature (0.0 = deterministic, higher = more random)
+            on_segment: Optional callback given each segment's text as soon as
+                it is decoded (faster-whisper streams; openai-whisper calls it
+                once with the full text)
             
         Returns:
             Tuple of (transcribed text, full result dict)
@@ -133,12 +196,23 @@ class PronunciationTrainer:
         """
         print("🎧 Transcribing audio...")
         
+        if self.backend == "faster-whisper":
+            return self._transcribe_faster_whisper(audio_file, prompt, temperature, on_segment)
+        
         # Build transcription parameters
         params = {
             "audio": audio_file,
             "language": "pt",  # Whisper only has "pt" (covers both BR and EU variants)
             "task": "transcribe",
             "temperature": temperature,
+            # Short single-utterance clips: no timestamp tokens and no
+            # conditioning on earlier windows. beam_size stays unset: any value
+            # selects openai-whisper's beam search, while temperature 0 with no
+            # beam_size is its greedy decoder.
+            "without_timestamps": True,
+            "condition_on_previous_text": False,
+            "no_speech_threshold": 0.4,
+            "compression_ratio_threshold": 2.4,
         }
         
         # Add prompt if provided (helps guide recognition)
@@ -146,12 +220,110 @@ class PronunciationTrainer:
             params["initial_prompt"] = prompt
         
         result = self.whisper.transcribe(**params)
+        if on_segment:
+            on_segment(result["text"])
         
         text = result["text"].strip().lower()
         print(f"✓ Recognized: \"{text}\"\n")
         
         return text, result
     
+    def _transcribe_faster_whisper(
+        self,
+        audio_file: Union[str, np.ndarray],
+        prompt: Optional[str],
+        temperature: float,
+        on_segment: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, Dict]:
+        """Transcribe with faster-whisper, returning the same shape as openai-whisper"""
+        # Practice clips are a few seconds long: crop to the VAD speech spans
+        # and skip timestamp tokens rather than decoding a padded 30 s window
+        segments, info = self.whisper.transcribe(
+            audio_file,
+            language="pt",
+            task="transcribe",
+            beam_size=1,
+            temperature=temperature,
+            initial_prompt=prompt,
+            without_timestamps=True,
+            condition_on_previous_text=False,
+            no_speech_threshold=0.4,
+            compression_ratio_threshold=2.4,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=300, threshold=0.35)
+        )
+        # segments is a generator: each one is decoded as it is consumed
+        decoded = []
+        for segment in segments:
+            decoded.append(segment)
+            if on_segment:
+                on_segment(segment.text)
+        segments = decoded
+        raw_text = "".join(segment.text for segment in segments)
+        
+        text = raw_text.strip().lower()
+        print(f"✓ Recognized: \"{text}\"\n")
+        
+        result = {
+            "text": raw_text,
+            "segments": [
+                {"start": seg.start, "end": seg.end, "text": seg.text}
+                for seg in segments
+            ],
+            "language": info.language
+        }
+        return text, result
+    
+    def transcribe_batch(
+        self,
+        audios: List[np.ndarray],
+        batch_size: int = 8
+    ) -> List[str]:
+        """
+        Transcribe several short clips, batching the Whisper forward pass
+        
+        Args:
+            audios: 16 kHz mono float32 clips
+            batch_size: Number of clips decoded together
+            
+        Returns:
+            Recognized text for each clip, in input order
+            
+        Note:
+            A decode batch shares one set of options, so no per-clip prompt
+            is used. faster-whisper has no multi-clip API and is transcribed
+            clip by clip.
+        """
+        print(f"🎧 Transcribing {len(audios)} clips...")
+        
+        if self.backend == "faster-whisper":
+            return [self._transcribe_faster_whisper(audio, None, 0.0)[0] for audio in audios]
+        
+        options = whisper.DecodingOptions(
+            language="pt",
+            task="transcribe",
+            temperature=0.0,
+            without_timestamps=True,
+            fp16=self.whisper.device.type == "cuda"
+        )
+        
+        import torch  # installed with openai-whisper
+        
+        texts = []
+        for start in range(0, len(audios), batch_size):
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(audio.astype(np.float32)),
+                    n_mels=self.whisper.dims.n_mels
+                )
+                for audio in audios[start:start + batch_size]
+            ]).to(self.whisper.device)
+            results = whisper.decode(self.whisper, mel, options)
+            texts.extend(result.text.strip().lower() for result in results)
+        
+        print(f"✓ Transcribed {len(texts)} clips\n")
+        return texts
+    
     def get_phonemes(self, text: str) -> str:
         """
         Get eSpeak phoneme codes (eIPA) for text
@@ -217,19 +389,7 @@ class PronunciationTrainer:
         Returns:
             Tuple of (exact_match, similarity_score)
         """
-        exact_match = user_phonemes == correct_phonemes
-        
-        # Simple similarity: character-level matching
-        if len(correct_phonemes) == 0:
-            similarity = 0.0
-        else:
-            matches = sum(
-                1 for a, b in zip(user_phonemes, correct_phonemes)
-                if a == b
-            )
-            similarity = matches / max(len(user_phonemes), len(correct_phonemes))
-        
-        return exact_match, similarity
+        return phoneme_similarity(user_phonemes, correct_phonemes)
     
     def check_recognition_quality(
         self,
@@ -469,6 +629,12 @@ Examples:
         choices=["tiny", "base", "small", "medium", "large"],
         help="Whisper model size (default: base)"
     )
+    parser.add_argument(
+        "--backend",
+        default="openai-whisper",
+        choices=["openai-whisper", "faster-whisper"],
+        help="Whisper backend (default: openai-whisper)"
+    )
     parser.add_argument(
         "--voice",
         "-v",
@@ -517,7 +683,8 @@ Examples:
     trainer = PronunciationTrainer(
         espeak_path=args.espeak,
         whisper_model=args.model,
-        voice=args.voice
+        voice=args.voice,
+        backend=args.backend
     )
     
     # Run training
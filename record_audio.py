@@ -14,27 +14,34 @@ Usage:
 """
 
 import argparse
+import queue
 import sys
+import threading
+import wave
 
-try:
-    import sounddevice as sd
-    import soundfile as sf
-    import numpy as np
-except ImportError as e:
-    print(f"Error: {e}")
-    print("\nPlease activate the virtual environment:")
-    print("  source venv/bin/activate")
-    sys.exit(1)
+
+def _require_audio():
+    """Import sounddevice on first use so --help works without the audio stack"""
+    try:
+        import sounddevice as sd
+    except ImportError as e:
+        print(f"Error: {e}")
+        print("\nPlease activate the virtual environment:")
+        print("  source venv/bin/activate")
+        sys.exit(1)
+    return sd
 
 
 def list_devices():
     """List available audio devices"""
+    sd = _require_audio()
     print("\n🎤 Available audio devices:\n")
     print(sd.query_devices())
 
 
 def test_microphone(duration=2):
     """Test microphone recording"""
+    sd = _require_audio()
     print(f"\n🎤 Testing microphone...")
     print(f"Recording {duration} seconds...")
     print("Speak now!")
@@ -43,42 +50,110 @@ def test_microphone(duration=2):
         int(duration * 16000),
         samplerate=16000,
         channels=1,
-        dtype='float32'
+        dtype='int16'
     )
     sd.wait()
     
     print("✓ Recording complete")
     print("\n🔊 Playing back...")
-    sd.play(recording, 16000)
-    sd.wait()
+    # Blocking writes keep the wait inside PortAudio (GIL released) instead
+    # of running a Python callback per buffer as sd.play does.
+    with sd.OutputStream(
+        samplerate=16000,
+        channels=1,
+        dtype='int16',
+        blocksize=2048,
+        latency='high'
+    ) as out:
+        for i in range(0, len(recording), 4096):
+            out.write(recording[i:i + 4096])
     print("✓ Playback complete\n")
 
 
 def record_audio(output_file, duration=3, samplerate=16000):
-    """Record audio to file"""
+    """Record audio to file, streaming blocks to disk as they arrive"""
+    sd = _require_audio()
+    import numpy as np  # always present alongside sounddevice
     print(f"\n🎤 Recording to: {output_file}")
     print(f"Duration: {duration} seconds")
     print("Speak now!")
     print()
     
-    recording = sd.rec(
-        int(duration * samplerate),
-        samplerate=samplerate,
-        channels=1,
-        dtype='float32'
-    )
+    # Double buffer: the PortAudio callback fills one preallocated buffer
+    # while a writer thread flushes the other, so disk I/O overlaps capture
+    # and memory stays flat at two buffers regardless of duration.
+    # A buffer only goes back to the callback (via `free`) once it is flushed.
+    buffer_frames = samplerate  # one second per buffer
+    buffers = np.zeros((2, buffer_frames), dtype='int16')
+    active = 0
+    filled = 0
+    dropped = 0
+    full = queue.Queue()
+    free = queue.Queue()
+    free.put(1)
     
-    # Progress indicator
-    for i in range(duration):
-        print(f"  {'█' * (i + 1)}{'░' * (duration - i - 1)} {i + 1}s")
-        sd.sleep(1000)
+    def callback(indata, frames, time_info, status):
+        nonlocal active, filled, dropped
+        data = indata[:, 0]
+        while len(data):
+            if active is None:
+                try:
+                    active = free.get_nowait()
+                except queue.Empty:
+                    # Both buffers still wait on the disk: drop this audio
+                    # rather than overwrite samples not yet written
+                    dropped += len(data)
+                    return
+            n = min(len(data), buffer_frames - filled)
+            buffers[active, filled:filled + n] = data[:n]
+            filled += n
+            data = data[n:]
+            if filled == buffer_frames:
+                full.put((active, filled))
+                active = None
+                filled = 0
     
-    sd.wait()
+    def writer(file):
+        while True:
+            item = full.get()
+            if item is None:
+                break
+            index, length = item
+            file.writeframes(buffers[index, :length].tobytes())
+            free.put(index)
     
-    print(f"\n✓ Recording complete")
-    print(f"💾 Saving to {output_file}...")
+    # Blocks are already mono int16, so the stdlib wave writer needs no
+    # conversion and libsndfile never has to be loaded
+    with wave.open(output_file, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(samplerate)
+        
+        writer_thread = threading.Thread(target=writer, args=(file,))
+        writer_thread.start()
+        
+        with sd.InputStream(
+            samplerate=samplerate,
+            channels=1,
+            dtype='int16',
+            blocksize=2048,
+            callback=callback
+        ):
+            # Progress indicator
+            for i in range(duration):
+                print(f"  {'█' * (i + 1)}{'░' * (duration - i - 1)} {i + 1}s")
+                sd.sleep(1000)
+        
+        # Flush the partially filled buffer once capture has stopped
+        if active is not None and filled:
+            full.put((active, filled))
+        full.put(None)
+        writer_thread.join()
     
-    sf.write(output_file, recording, samplerate)
+    print(f"\n✓ Recording complete")
+    if dropped:
+        print(f"⚠️  Overrun: disk writes fell behind, {dropped} samples "
+              f"({dropped / samplerate:.2f}s) were dropped")
     print("✓ Saved successfully\n")
 
 
@@ -14,22 +14,39 @@ Usage:
     python3 speak_phonemes.py -i input.txt         # Process file of phoneme codes
 """
 
+import re
 import subprocess
 import sys
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 
 # Configuration
 REPO_DIR = Path(__file__).parent
-ESPEAK_CMD = REPO_DIR / "local/bin/run-espeak-ng"
+ESPEAK_CMD = str((REPO_DIR / "local/bin/run-espeak-ng").resolve())
 DEFAULT_VOICE = "pt-br"  # Brazilian Portuguese by default
+BRACKETS_RE = re.compile(r"\[\[|\]\]")
+
+# espeak-ng never reads stdin and no descriptors need closing in the child,
+# which lets Popen skip the close-all-fds pass after fork
+SPAWN_KWARGS = {"stdin": subprocess.DEVNULL, "close_fds": False}
+
+
+@functools.lru_cache(maxsize=1024)
+def bracketed(phoneme_codes):
+    """Wrap phoneme codes in [[ ]] unless already wrapped, cached per line"""
+    if phoneme_codes.startswith("[["):
+        return phoneme_codes
+    return f"[[{phoneme_codes}]]"
 
 class BrazilianPortuguesePhonemes:
     def __init__(self, voice="pt-br", speed=160, pitch=40):
         self.voice = voice
         self.speed = speed
         self.pitch = pitch
+        self._transcriptions = {}
     
     def speak_phonemes(self, phoneme_codes, label=None):
         """Speak eSpeak phoneme codes using [[ ]] notation"""
@@ -37,17 +54,16 @@ class BrazilianPortuguesePhonemes:
             return
         
         # Wrap in [[ ]] if not already
-        if not phoneme_codes.startswith("[["):
-            phoneme_codes = f"[[{phoneme_codes}]]"
+        phoneme_codes = bracketed(phoneme_codes)
         
         if label:
             print(f"{label}: {phoneme_codes}")
         
         subprocess.run([
-            str(ESPEAK_CMD), "-v", self.voice,
+            ESPEAK_CMD, "-v", self.voice,
             "-s", str(self.speed), "-p", str(self.pitch),
             phoneme_codes
-        ])
+        ], **SPAWN_KWARGS)
     
     def speak_text(self, text, label=None):
         """Speak Brazilian Portuguese text normally"""
@@ -55,29 +71,55 @@ class BrazilianPortuguesePhonemes:
             print(f"{label}: {text}")
         
         subprocess.run([
-            str(ESPEAK_CMD), "-v", self.voice,
+            ESPEAK_CMD, "-v", self.voice,
             "-s", str(self.speed), "-p", str(self.pitch),
             text
-        ])
+        ], **SPAWN_KWARGS)
     
     def get_phonemes(self, text):
         """Get eSpeak phoneme codes for Brazilian Portuguese text"""
         result = subprocess.run(
-            [str(ESPEAK_CMD), "-v", self.voice, "-x", "-q", text],
-            capture_output=True,
-            text=True
+            [ESPEAK_CMD, "-v", self.voice, "-x", "-q", text],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            **SPAWN_KWARGS
         )
         return result.stdout.strip()
     
     def get_ipa(self, text):
         """Get IPA transcription for Brazilian Portuguese text"""
         result = subprocess.run(
-            [str(ESPEAK_CMD), "-v", self.voice, "--ipa", "-q", text],
-            capture_output=True,
-            text=True
+            [ESPEAK_CMD, "-v", self.voice, "--ipa", "-q", text],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            **SPAWN_KWARGS
         )
         return result.stdout.strip()
     
+    def get_phonemes_and_ipa(self, text):
+        """Get both eSpeak phoneme codes and IPA, memoized per text"""
+        if text in self._transcriptions:
+            return self._transcriptions[text]
+        
+        # espeak-ng prints a single format per run (--ipa overrides -x), so
+        # start both processes before waiting on either
+        procs = [
+            subprocess.Popen(
+                [ESPEAK_CMD, "-v", self.voice, flag, "-q", text],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                **SPAWN_KWARGS
+            )
+            for flag in ("-x", "--ipa")
+        ]
+        phonemes, ipa = (proc.communicate()[0].strip() for proc in procs)
+        
+        self._transcriptions[text] = (phonemes, ipa)
+        return phonemes, ipa
+    
     def compare_pronunciation(self, your_phonemes, correct_text):
         """
         Compare your phoneme pronunciation with correct Brazilian Portuguese
@@ -90,7 +132,7 @@ class BrazilianPortuguesePhonemes:
         correct_ipa = self.get_ipa(correct_text)
         
         # Clean up for comparison
-        your_clean = your_phonemes.replace("[[", "").replace("]]", "").strip()
+        your_clean = BRACKETS_RE.sub("", your_phonemes).strip()
         correct_clean = correct_phonemes.strip()
         
         match = (your_clean == correct_clean)
@@ -104,23 +146,23 @@ class BrazilianPortuguesePhonemes:
         print(f"Match:            {'✓ YES' if match else '✗ NO'}")
         print(f"{'='*60}\n")
         
-        # Speak correct version
-        print("Speaking CORRECT pronunciation:")
-        self.speak_text(correct_text)
-        time.sleep(0.5)
-        
-        # Speak your version
-        print("Speaking YOUR pronunciation:")
-        self.speak_phonemes(your_clean)
+        # Speak correct version, then your version, in one espeak-ng call;
+        # the ellipsis gives the pause between them
+        print("Speaking CORRECT pronunciation, then YOUR pronunciation")
+        subprocess.run([
+            ESPEAK_CMD, "-v", self.voice,
+            "-s", str(self.speed), "-p", str(self.pitch),
+            f"{correct_text}... [[{your_clean}]]"
+        ], **SPAWN_KWARGS)
         
         return match
     
     def text_to_audio(self, text, output_file):
         """Save Brazilian Portuguese text to WAV file"""
         subprocess.run([
-            str(ESPEAK_CMD), "-v", self.voice,
+            ESPEAK_CMD, "-v", self.voice,
             "-w", output_file, text
-        ])
+        ], **SPAWN_KWARGS)
         print(f"Saved to: {output_file}")
 
 
@@ -181,10 +223,18 @@ Examples:
     # Mode: Get correct phonemes for text
     if args.correct:
         words = args.correct.split()
-        for word in words:
-            phonemes = speaker.get_phonemes(word)
-            ipa = speaker.get_ipa(word) if args.ipa else ""
-            
+        
+        # Words are independent, so run their espeak-ng lookups in parallel
+        # and keep only printing and speaking sequential
+        def transcribe(word):
+            if args.ipa:
+                return speaker.get_phonemes_and_ipa(word)
+            return speaker.get_phonemes(word), ""
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(words) or 1)) as ex:
+            transcriptions = list(ex.map(transcribe, words))
+        
+        for word, (phonemes, ipa) in zip(words, transcriptions):
             print(f"\nWord:     {word}")
             print(f"Phonemes: {phonemes}")
             if args.ipa:
@@ -212,14 +262,14 @@ Examples:
     # Mode: Process file
     if args.input_file:
         with open(args.input_file) as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                
-                print(f"Phonemes: {line}")
-                speaker.speak_phonemes(line)
-                time.sleep(0.3)
+            chunks = [line.strip() for line in f
+                      if line.strip() and not line.strip().startswith("#")]
+        
+        for chunk in chunks:
+            print(f"Phonemes: {chunk}")
+        
+        # One espeak-ng process for the whole file; "_ _" pauses between lines
+        speaker.speak_phonemes(" _ _ ".join(map(bracketed, chunks)))
         return
     
     # Mode: Speak phoneme codes
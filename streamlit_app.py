@@ -6,18 +6,28 @@ Run with: streamlit run streamlit_app.py
 """
 
 import streamlit as st
-import json
+import io
+import orjson
 import warnings
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
-import tempfile
+from typing import TYPE_CHECKING, Dict, List
+from concurrent.futures import ThreadPoolExecutor
 import os
+import gc
+import threading
 
 # Suppress FP16 warning from Whisper on CPU
 warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
 
-from pronunciation_trainer import PronunciationTrainer
+import numpy as np
+import pandas as pd
+import soundfile as sf
+
+# PronunciationTrainer pulls in whisper/torch; it is imported on first use in
+# get_trainer so the Statistics and History tabs render without it
+if TYPE_CHECKING:
+    from pronunciation_trainer import PronunciationTrainer
 
 
 # Page configuration
@@ -28,6 +38,18 @@ st.set_page_config(
 )
 
 
+# Columns shown for each practice in the History tab
+HISTORY_COLUMNS = [
+    "target", "recognized", "correct_phonemes", "user_phonemes",
+    "correct_ipa", "user_ipa", "similarity", "match"
+]
+
+
+HISTORY_FILE = Path("practice_history.jsonl")
+LEGACY_HISTORY_FILE = Path("practice_history.json")
+STATS_FILE = Path("practice_stats.json")
+
+
 def load_settings():
     """Load user settings from config file"""
     config_file = Path("practice_config.json")
@@ -36,14 +58,15 @@ def load_settings():
         "pitch": 35,
         "voice": "pt-br",
         "model": "base",
+        "backend": "faster-whisper",
+        "compute_type": "auto",
         "duration": 3,
     }
     
     if config_file.exists():
         try:
-            with open(config_file) as f:
-                saved = json.load(f)
-                default_settings.update(saved)
+            saved = orjson.loads(config_file.read_bytes())
+            default_settings.update(saved)
         except Exception:
             pass
     
@@ -53,40 +76,134 @@ def load_settings():
 def save_settings(settings: Dict):
     """Save settings to config file"""
     try:
-        with open("practice_config.json", 'w') as f:
-            json.dump(settings, f, indent=2)
+        Path("practice_config.json").write_bytes(
+            orjson.dumps(settings, option=orjson.OPT_INDENT_2)
+        )
     except Exception as e:
         st.error(f"Could not save settings: {e}")
 
 
-def load_history():
-    """Load practice history"""
-    history_file = Path("practice_history.json")
-    if history_file.exists():
+def migrate_legacy_history():
+    """Convert a practice_history.json list to the JSONL history once"""
+    if HISTORY_FILE.exists() or not LEGACY_HISTORY_FILE.exists():
+        return
+    try:
+        history = orjson.loads(LEGACY_HISTORY_FILE.read_bytes())
+        HISTORY_FILE.write_bytes(b"".join(orjson.dumps(s) + b"\n" for s in history))
+    except Exception:
+        pass
+
+
+def practice_arrays(practices: List[Dict]):
+    """
+    Flatten practices into (similarities, matches) arrays for vectorized totals
+    
+    The history file is shared with app.py / streamlit_app_v2.py, whose
+    practices record exact_match rather than match; practices without a
+    similarity are skipped.
+    """
+    scored = [p for p in practices if "similarity" in p]
+    sims = np.fromiter((p["similarity"] for p in scored), dtype=np.float64, count=len(scored))
+    matches = np.fromiter(
+        (p.get("exact_match", p.get("match", False)) for p in scored), dtype=np.bool_, count=len(scored)
+    )
+    return sims, matches
+
+
+def session_summary(session: Dict):
+    """(perfect count, average similarity), from the stored aggregates when present"""
+    if "_perfect" in session:
+        return session["_perfect"], session["_avg_sim"]
+    sims, matches = practice_arrays(session["practices"])
+    return int(matches.sum()), float(sims.mean()) if len(sims) else 0.0
+
+
+def add_session_to_stats(stats: Dict, session: Dict):
+    """Fold one saved session into the running history totals"""
+    count = len(session["practices"])
+    perfect, avg_sim = session_summary(session)
+    stats["n_sessions"] += 1
+    stats["total_practices"] += count
+    stats["total_perfect"] += perfect
+    stats["sum_similarity"] += avg_sim * count
+    stats["last_date"] = session["date"]
+
+
+def load_stats() -> Dict:
+    """Load running history totals, rebuilding them from the history if missing"""
+    if STATS_FILE.exists():
         try:
-            with open(history_file) as f:
-                return json.load(f)
+            return orjson.loads(STATS_FILE.read_bytes())
         except Exception:
-            return []
-    return []
+            pass
+    
+    stats = {
+        "n_sessions": 0,
+        "total_practices": 0,
+        "total_perfect": 0,
+        "sum_similarity": 0.0,
+        "last_date": None
+    }
+    if HISTORY_FILE.exists():
+        for line in HISTORY_FILE.read_bytes().splitlines():
+            if line.strip():
+                add_session_to_stats(stats, orjson.loads(line))
+    return stats
+
 
+def write_stats(stats: Dict):
+    """Replace STATS_FILE atomically, so a crash mid-write can't truncate it"""
+    tmp = STATS_FILE.with_name(f"{STATS_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, STATS_FILE)
 
-def save_history(history: List[Dict]):
-    """Save practice history"""
+
+def append_history(session: Dict, stats: Dict):
+    """Append one session to the JSONL history and update the running totals"""
     try:
-        with open("practice_history.json", 'w') as f:
-            json.dump(history, f, indent=2)
+        # Other browser sessions and apps also advance the totals: start from
+        # the file, read before appending so a rebuild doesn't count this session
+        stats.clear()
+        stats.update(load_stats())
+        with open(HISTORY_FILE, 'ab') as f:
+            f.write(orjson.dumps(session) + b"\n")
+        add_session_to_stats(stats, session)
+        write_stats(stats)
     except Exception as e:
         st.error(f"Could not save history: {e}")
 
 
+@st.cache_data(max_entries=1)
+def load_recent_sessions(n_sessions: int, limit: int = 10) -> List[Dict]:
+    """
+    Read the last `limit` sessions by scanning the history backwards
+    
+    n_sessions is only the cache key, so a newly saved session refreshes it.
+    """
+    if not HISTORY_FILE.exists():
+        return []
+    
+    with open(HISTORY_FILE, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0 and data.count(b"\n") <= limit:
+            step = min(65536, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    
+    lines = [line for line in data.splitlines() if line.strip()][-limit:]
+    return [orjson.loads(line) for line in lines]
+
+
 def initialize_session_state():
     """Initialize Streamlit session state"""
     if 'settings' not in st.session_state:
         st.session_state.settings = load_settings()
     
-    if 'history' not in st.session_state:
-        st.session_state.history = load_history()
+    if 'stats' not in st.session_state:
+        migrate_legacy_history()
+        st.session_state.stats = load_stats()
     
     if 'current_session' not in st.session_state:
         st.session_state.current_session = {
@@ -101,6 +218,165 @@ def initialize_session_state():
         st.session_state.last_result = None
 
 
+@st.cache_resource(max_entries=2)
+def get_trainer(model: str, voice: str, backend: str, compute_type: str) -> "PronunciationTrainer":
+    """Load a PronunciationTrainer once and share it across all sessions"""
+    from pronunciation_trainer import PronunciationTrainer
+    
+    trainer = PronunciationTrainer(
+        whisper_model=model,
+        voice=voice,
+        backend=backend,
+        compute_type=compute_type
+    )
+    warm_up_trainer(trainer)
+    return trainer
+
+
+def warm_up_trainer(trainer: "PronunciationTrainer"):
+    """Run a dummy transcription and phoneme lookup so the first real submit is fast"""
+    try:
+        trainer.transcribe_audio(np.zeros(16000, dtype=np.float32), prompt="olá", temperature=0.0)
+        trainer.get_phonemes("a")
+    except Exception:
+        pass  # Warmup is best effort; the real request will surface errors
+
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Thread pool shared across reruns for overlapping independent steps"""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def release_trainers():
+    """Drop cached trainers so the previous Whisper model can be freed"""
+    get_trainer.clear()
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+@st.cache_data(max_entries=4096)
+def get_target_pronunciation(text: str, voice: str, _trainer: "PronunciationTrainer"):
+    """Get (phonemes, IPA) for a target text, cached across reruns and retries"""
+    return lookup_pronunciation(_trainer, text)
+
+
+def lookup_pronunciation(trainer: "PronunciationTrainer", text: str):
+    """Get (phonemes, IPA) with the two espeak-ng processes running concurrently"""
+    executor = get_executor()
+    phonemes_future = executor.submit(trainer.get_phonemes, text)
+    ipa_future = executor.submit(trainer.get_ipa, text)
+    return phonemes_future.result(), ipa_future.result()
+
+
+def decode_audio(audio_bytes: bytes) -> np.ndarray:
+    """Decode recorded WAV bytes to the 16 kHz mono float32 array Whisper expects"""
+    audio, sr = sf.read(io.BytesIO(audio_bytes), dtype='float32', always_2d=True)
+    audio = audio.mean(axis=1)
+    if sr != 16000:
+        import librosa
+        # soxr's quick polyphase filter is plenty for speech recognition input
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=16000, res_type='soxr_qq')
+    return audio
+
+
+def trim_silence(audio: np.ndarray, sr: int = 16000, threshold_db: float = -40.0,
+                 frame_length: int = 256, padding: float = 0.1) -> np.ndarray:
+    """Strip leading/trailing frames quieter than threshold_db (dBFS RMS)"""
+    n_frames = len(audio) // frame_length
+    if n_frames == 0:
+        return audio[:0]
+    
+    frames = audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    voiced = np.flatnonzero(rms > 10 ** (threshold_db / 20))
+    if len(voiced) == 0:
+        return audio[:0]
+    
+    pad = int(padding * sr)
+    start = max(0, voiced[0] * frame_length - pad)
+    end = min(len(audio), (voiced[-1] + 1) * frame_length + pad)
+    return audio[start:end]
+
+
+def score_attempt(trainer: "PronunciationTrainer", text: str, recognized_text: str,
+                  correct_phonemes: str, correct_ipa: str) -> Dict:
+    """Compare recognized text against the target and record it in the current session"""
+    # Check recognition quality
+    is_valid, warning = trainer.check_recognition_quality(recognized_text, text)
+    quality_issues = [warning] if not is_valid and warning else []
+    
+    # Get phonemes of what they said; a perfect transcription reuses the target's
+    if recognized_text.strip().casefold() == text.strip().casefold():
+        user_phonemes, user_ipa = correct_phonemes, correct_ipa
+    else:
+        user_phonemes, user_ipa = lookup_pronunciation(trainer, recognized_text)
+    
+    # Compare
+    exact_match, similarity = trainer.compare_phonemes(user_phonemes, correct_phonemes)
+    
+    result = {
+        "target": text,
+        "recognized": recognized_text,
+        "correct_phonemes": correct_phonemes,
+        "user_phonemes": user_phonemes,
+        "correct_ipa": correct_ipa,
+        "user_ipa": user_ipa,
+        "exact_match": exact_match,
+        "similarity": similarity,
+        "quality_issues": quality_issues
+    }
+    
+    record_practice(result)
+    st.session_state.last_result = result
+    
+    return result
+
+
+def record_practice(result: Dict):
+    """Save a practice result to the current session"""
+    st.session_state.current_session["practices"].append({
+        "time": datetime.now().isoformat(),
+        "target": result["target"],
+        "recognized": result["recognized"],
+        "correct_phonemes": result["correct_phonemes"],
+        "user_phonemes": result["user_phonemes"],
+        "correct_ipa": result.get("correct_ipa", ""),
+        "user_ipa": result.get("user_ipa", ""),
+        "match": result["exact_match"],
+        "similarity": result["similarity"]
+    })
+    st.session_state.session_saved = False
+
+
+NO_SPEECH_ISSUE = "No speech detected in the recording"
+
+
+def has_speech(audio: np.ndarray) -> bool:
+    """Whether a trimmed 16 kHz clip has enough left to be worth transcribing"""
+    return len(audio) >= 0.2 * 16000
+
+
+def no_speech_result(text: str, correct_phonemes: str, correct_ipa: str) -> Dict:
+    """Result for a recording that was silence once trimmed"""
+    return {
+        "target": text,
+        "recognized": "",
+        "correct_phonemes": correct_phonemes,
+        "user_phonemes": "",
+        "correct_ipa": correct_ipa,
+        "user_ipa": "",
+        "exact_match": False,
+        "similarity": 0.0,
+        "quality_issues": [NO_SPEECH_ISSUE]
+    }
+
+
 def practice_word_streamlit(text: str, audio_bytes: bytes, speed: int, pitch: int, voice: str, model: str):
     """
     Practice a word/phrase using pre-recorded audio from Streamlit
@@ -117,87 +393,118 @@ def practice_word_streamlit(text: str, audio_bytes: bytes, speed: int, pitch: in
         Practice result dictionary
     """
     try:
-        # Save audio bytes to temporary file
-        temp_audio = "temp_streamlit_recording.wav"
-        with open(temp_audio, 'wb') as f:
-            f.write(audio_bytes)
-        
-        # Initialize trainer without loading Whisper yet (to avoid reload)
-        if 'trainer' not in st.session_state or st.session_state.get('trainer_model') != model:
-            st.session_state.trainer = PronunciationTrainer(whisper_model=model, voice=voice)
-            st.session_state.trainer_model = model
+        # Decode in memory instead of round-tripping through a temp file,
+        # then drop leading/trailing silence so Whisper only sees speech
+        audio = trim_silence(decode_audio(audio_bytes))
         
-        trainer = st.session_state.trainer
+        settings = st.session_state.settings
+        trainer = get_trainer(model, voice, settings['backend'], settings['compute_type'])
         
         # Get correct pronunciation
-        correct_phonemes = trainer.get_phonemes(text)
-        correct_ipa = trainer.get_ipa(text)
-        
-        # Speak the correct pronunciation
-        trainer.speak_text(text, speed=speed, pitch=pitch)
-        
-        # Transcribe user's audio
-        recognized_text, whisper_result = trainer.transcribe_audio(
-            temp_audio,
-            prompt=text,
-            temperature=0.0
-        )
-        
-        # Check recognition quality
-        is_valid, warning = trainer.check_recognition_quality(recognized_text, text)
-        quality_issues = [warning] if not is_valid and warning else []
+        correct_phonemes, correct_ipa = get_target_pronunciation(text, voice, trainer)
+        
+        # Nothing but silence: skip Whisper entirely
+        if not has_speech(audio):
+            result = no_speech_result(text, correct_phonemes, correct_ipa)
+            st.session_state.last_result = result
+            return result
+        
+        # Speak the correct pronunciation while transcribing the user's audio;
+        # the two are independent, so this costs max(TTS, ASR) rather than the sum.
+        # Transcription stays on the script thread so segments can be streamed
+        # to the page as they are decoded.
+        tts_future = get_executor().submit(trainer.speak_text, text, speed=speed, pitch=pitch)
+        with st.status("Transcribing...", expanded=True) as status:
+            placeholder = st.empty()
+            parts = []
+            
+            def show_segment(segment_text: str):
+                parts.append(segment_text)
+                placeholder.write("".join(parts))
+            
+            recognized_text, whisper_result = trainer.transcribe_audio(
+                audio,
+                prompt=text,
+                temperature=0.0,
+                on_segment=show_segment
+            )
+            status.update(label="Transcribed", state="complete", expanded=False)
+        tts_future.result()
         
-        # Get phonemes of what they said
-        user_phonemes = trainer.get_phonemes(recognized_text)
-        user_ipa = trainer.get_ipa(recognized_text)
+        return score_attempt(trainer, text, recognized_text, correct_phonemes, correct_ipa)
         
-        # Compare
-        exact_match, similarity = trainer.compare_phonemes(user_phonemes, correct_phonemes)
+    except Exception as e:
+        st.error(f"Error during practice: {e}")
+        import traceback
+        st.error(traceback.format_exc())
+        return None
+
+
+def practice_batch_streamlit(items: List, voice: str, model: str):
+    """
+    Score several recorded items with one batched Whisper pass
+    
+    Args:
+        items: (target text, audio bytes) pairs
+        voice: eSpeak voice
+        model: Whisper model
         
-        # Clean up temp file
-        Path(temp_audio).unlink(missing_ok=True)
+    Returns:
+        List of practice result dictionaries
+    """
+    try:
+        settings = st.session_state.settings
+        trainer = get_trainer(model, voice, settings['backend'], settings['compute_type'])
         
-        result = {
-            "target": text,
-            "recognized": recognized_text,
-            "correct_phonemes": correct_phonemes,
-            "user_phonemes": user_phonemes,
-            "correct_ipa": correct_ipa,
-            "user_ipa": user_ipa,
-            "exact_match": exact_match,
-            "similarity": similarity,
-            "quality_issues": quality_issues
-        }
+        audios = [trim_silence(decode_audio(audio_bytes)) for _, audio_bytes in items]
         
-        # Save to current session
-        st.session_state.current_session["practices"].append({
-            "time": datetime.now().isoformat(),
-            "target": result["target"],
-            "recognized": result["recognized"],
-            "correct_phonemes": result["correct_phonemes"],
-            "user_phonemes": result["user_phonemes"],
-            "correct_ipa": result.get("correct_ipa", ""),
-            "user_ipa": result.get("user_ipa", ""),
-            "match": result["exact_match"],
-            "similarity": result["similarity"]
-        })
-        st.session_state.session_saved = False
-        st.session_state.last_result = result
+        # Silent clips skip Whisper like in practice_word_streamlit
+        voiced = [i for i, audio in enumerate(audios) if has_speech(audio)]
+        recognized = dict(zip(voiced, trainer.transcribe_batch([audios[i] for i in voiced])))
         
-        return result
+        results = []
+        for i, (text, _) in enumerate(items):
+            correct_phonemes, correct_ipa = get_target_pronunciation(text, voice, trainer)
+            if i in recognized:
+                results.append(score_attempt(trainer, text, recognized[i], correct_phonemes, correct_ipa))
+            else:
+                # Keep a row for the lost take, so it shows up in the session
+                result = no_speech_result(text, correct_phonemes, correct_ipa)
+                record_practice(result)
+                results.append(result)
+        return results
         
     except Exception as e:
-        st.error(f"Error during practice: {e}")
+        st.error(f"Error during batch practice: {e}")
         import traceback
         st.error(traceback.format_exc())
-        return None
+        return []
+
+
+def finish_file_practice():
+    """Transcribe any batched File Practice recordings and reset the practice"""
+    items = st.session_state.file_batch_items
+    if items:
+        with st.spinner(f"Transcribing {len(items)} recordings..."):
+            results = practice_batch_streamlit(
+                items,
+                st.session_state.settings['voice'],
+                st.session_state.settings['model']
+            )
+        silent = [r["target"] for r in results if NO_SPEECH_ISSUE in r["quality_issues"]]
+        if silent:
+            st.warning(f"⚠️ No speech detected for {len(silent)} item(s): " + ", ".join(silent))
+        st.session_state.file_batch_items = []
+    st.session_state.file_practice_index = 0
 
 
 def save_current_session():
     """Save current session to history"""
     if st.session_state.current_session["practices"]:
-        st.session_state.history.append(st.session_state.current_session)
-        save_history(st.session_state.history)
+        # Sessions are immutable once saved, so store their aggregates inline
+        session = st.session_state.current_session
+        session["_perfect"], session["_avg_sim"] = session_summary(session)
+        append_history(session, st.session_state.stats)
         
         # Reset current session
         st.session_state.current_session = {
@@ -222,38 +529,69 @@ def main():
     with st.sidebar:
         st.header("⚙️ Settings")
         
-        # Voice settings
-        st.session_state.settings['speed'] = st.slider(
-            "Speed (wpm)", 80, 450, st.session_state.settings['speed'], 10,
-            help="Lower = slower speech"
-        )
-        
-        st.session_state.settings['pitch'] = st.slider(
-            "Pitch", 0, 99, st.session_state.settings['pitch'], 5
-        )
-        
-        st.session_state.settings['voice'] = st.selectbox(
-            "Voice",
-            ["pt-br", "pt"],
-            index=0 if st.session_state.settings['voice'] == "pt-br" else 1,
-            help="pt-br = Brazilian, pt = European"
-        )
-        
-        st.session_state.settings['model'] = st.selectbox(
-            "Whisper Model",
-            ["tiny", "base", "small", "medium", "large"],
-            index=["tiny", "base", "small", "medium", "large"].index(st.session_state.settings['model'])
-        )
-        
-        st.session_state.settings['duration'] = st.number_input(
-            "Recording Duration (seconds)",
-            min_value=1, max_value=10,
-            value=st.session_state.settings['duration']
-        )
+        settings = st.session_state.settings
         
-        if st.button("💾 Save Settings"):
-            save_settings(st.session_state.settings)
-            st.success("Settings saved!")
+        # One form so adjusting several widgets triggers a single rerun
+        with st.form("settings"):
+            # Voice settings
+            speed = st.slider(
+                "Speed (wpm)", 80, 450, settings['speed'], 10,
+                help="Lower = slower speech"
+            )
+            
+            pitch = st.slider(
+                "Pitch", 0, 99, settings['pitch'], 5
+            )
+            
+            voice = st.selectbox(
+                "Voice",
+                ["pt-br", "pt"],
+                index=0 if settings['voice'] == "pt-br" else 1,
+                help="pt-br = Brazilian, pt = European"
+            )
+            
+            model = st.selectbox(
+                "Whisper Model",
+                ["tiny", "base", "small", "medium", "large"],
+                index=["tiny", "base", "small", "medium", "large"].index(settings['model'])
+            )
+            
+            backend = st.selectbox(
+                "Whisper Backend",
+                ["faster-whisper", "openai-whisper"],
+                index=["faster-whisper", "openai-whisper"].index(settings['backend']),
+                help="faster-whisper (CTranslate2) is several times faster on CPU"
+            )
+            
+            compute_type = st.selectbox(
+                "Compute Type",
+                ["auto", "int8", "int8_float16", "float16", "float32"],
+                index=["auto", "int8", "int8_float16", "float16", "float32"].index(
+                    settings['compute_type']),
+                help="faster-whisper only; auto = int8 on CPU, float16 on GPU"
+            )
+            
+            duration = st.number_input(
+                "Recording Duration (seconds)",
+                min_value=1, max_value=10,
+                value=settings['duration']
+            )
+            
+            if st.form_submit_button("💾 Apply Settings"):
+                if (model, backend, compute_type) != (
+                        settings['model'], settings['backend'], settings['compute_type']):
+                    release_trainers()
+                settings.update({
+                    "speed": speed,
+                    "pitch": pitch,
+                    "voice": voice,
+                    "model": model,
+                    "backend": backend,
+                    "compute_type": compute_type,
+                    "duration": duration,
+                })
+                save_settings(settings)
+                st.success("Settings saved!")
         
         st.markdown("---")
         
@@ -385,8 +723,15 @@ def main():
         uploaded_file = st.file_uploader("Choose a file", type=['txt'])
         
         if uploaded_file:
-            content = uploaded_file.read().decode('utf-8')
-            lines = [l.strip() for l in content.split('\n') if l.strip() and not l.strip().startswith('#')]
+            # Parse once per uploaded file rather than on every rerun
+            if st.session_state.get('file_lines_id') != uploaded_file.file_id:
+                content = uploaded_file.getvalue().decode('utf-8')
+                st.session_state.file_lines = [
+                    l.strip() for l in content.splitlines()
+                    if l.strip() and not l.strip().startswith('#')
+                ]
+                st.session_state.file_lines_id = uploaded_file.file_id
+            lines = st.session_state.file_lines
             
             st.success(f"📚 Found {len(lines)} items")
             
@@ -399,15 +744,37 @@ def main():
             
             st.warning("⚠️ File practice mode: You'll need to record each item individually")
             
+            # Only openai-whisper decodes several clips in one pass; faster-whisper
+            # would transcribe them one by one anyway, with no gain to trade for
+            batch_available = st.session_state.settings['backend'] == "openai-whisper"
+            batch_mode = st.checkbox(
+                "Batch mode: record every item first, then transcribe them together",
+                key="file_batch_mode",
+                disabled=not batch_available,
+                help="Faster for long lists (one batched Whisper pass), but results only "
+                     "appear at the end and Whisper gets no per-item prompt. "
+                     "Requires the openai-whisper backend."
+            ) and batch_available
+            
             # Initialize file practice state
             if 'file_practice_index' not in st.session_state:
                 st.session_state.file_practice_index = 0
                 st.session_state.file_practice_lines = []
+                st.session_state.file_batch_items = []
             
             # Start button
             if st.session_state.file_practice_index == 0:
                 if st.button("▶️ Start Practice", key="file_start", type="primary"):
+                    # Look up every target once up front so each submit hits the cache
+                    with st.spinner("Preparing items..."):
+                        settings = st.session_state.settings
+                        voice = settings['voice']
+                        trainer = get_trainer(settings['model'], voice,
+                                              settings['backend'], settings['compute_type'])
+                        for line in lines:
+                            get_target_pronunciation(line, voice, trainer)
                     st.session_state.file_practice_lines = lines
+                    st.session_state.file_batch_items = []
                     st.session_state.file_practice_index = 1
                     st.rerun()
             
@@ -434,23 +801,27 @@ def main():
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        if st.button("✅ Submit & Next", key=f"file_submit_{current_index}", type="primary"):
-                            with st.spinner("Processing..."):
-                                result = practice_word_streamlit(
-                                    current_text,
-                                    audio_bytes,
-                                    st.session_state.settings['speed'],
-                                    st.session_state.settings['pitch'],
-                                    st.session_state.settings['voice'],
-                                    st.session_state.settings['model']
-                                )
+                        submit_label = "💾 Save & Next" if batch_mode else "✅ Submit & Next"
+                        if st.button(submit_label, key=f"file_submit_{current_index}", type="primary"):
+                            if batch_mode:
+                                st.session_state.file_batch_items.append((current_text, audio_bytes))
+                            else:
+                                with st.spinner("Processing..."):
+                                    result = practice_word_streamlit(
+                                        current_text,
+                                        audio_bytes,
+                                        st.session_state.settings['speed'],
+                                        st.session_state.settings['pitch'],
+                                        st.session_state.settings['voice'],
+                                        st.session_state.settings['model']
+                                    )
                             
                             # Move to next item
                             if current_index < len(st.session_state.file_practice_lines):
                                 st.session_state.file_practice_index += 1
                                 st.rerun()
                             else:
-                                st.session_state.file_practice_index = 0
+                                finish_file_practice()
                                 st.success("✓ All items completed!")
                                 st.balloons()
                     
@@ -460,7 +831,7 @@ def main():
                                 st.session_state.file_practice_index += 1
                                 st.rerun()
                             else:
-                                st.session_state.file_practice_index = 0
+                                finish_file_practice()
                                 st.info("Practice session completed")
             
             elif st.session_state.file_practice_index > 0:
@@ -478,8 +849,9 @@ def main():
         if st.session_state.current_session["practices"]:
             st.subheader("🔵 Current Session")
             practices = st.session_state.current_session["practices"]
-            perfect = sum(1 for p in practices if p["match"])
-            avg_sim = sum(p["similarity"] for p in practices) / len(practices)
+            sims, matches = practice_arrays(practices)
+            perfect = int(matches.sum())
+            avg_sim = float(sims.mean())
             
             col1, col2, col3 = st.columns(3)
             col1.metric("Practices", len(practices))
@@ -487,31 +859,23 @@ def main():
             col3.metric("Avg Similarity", f"{avg_sim:.1%}")
         
         # Overall stats
-        if st.session_state.history:
+        stats = st.session_state.stats
+        if stats["n_sessions"]:
             st.subheader("📈 All Time")
             
-            total_practices = sum(len(s["practices"]) for s in st.session_state.history)
-            total_perfect = sum(
-                sum(1 for p in s["practices"] if p["match"])
-                for s in st.session_state.history
-            )
-            
-            all_similarities = [
-                p["similarity"]
-                for s in st.session_state.history
-                for p in s["practices"]
-            ]
+            total_practices = stats["total_practices"]
+            total_perfect = stats["total_perfect"]
             
-            if all_similarities:
-                avg_all = sum(all_similarities) / len(all_similarities)
+            if total_practices:
+                avg_all = stats["sum_similarity"] / total_practices
                 
                 col1, col2, col3, col4 = st.columns(4)
                 col1.metric("Total Practices", total_practices)
                 col2.metric("Total Perfect", f"{total_perfect} ({total_perfect/total_practices:.1%})")
                 col3.metric("Overall Avg", f"{avg_all:.1%}")
-                col4.metric("Sessions", len(st.session_state.history))
+                col4.metric("Sessions", stats["n_sessions"])
                 
-                last_date = st.session_state.history[-1]['date'][:10]
+                last_date = stats["last_date"][:10]
                 st.info(f"Last session: {last_date}")
         else:
             st.info("No practice history yet. Start practicing to see statistics!")
@@ -520,39 +884,26 @@ def main():
     with tab5:
         st.header("📜 Session History")
         
-        if not st.session_state.history:
+        if not st.session_state.stats["n_sessions"]:
             st.info("No previous sessions")
         else:
             # Show recent sessions
             st.subheader("Recent Sessions")
             
-            for i, session in enumerate(reversed(st.session_state.history[-10:]), 1):
+            recent = load_recent_sessions(st.session_state.stats["n_sessions"])
+            for i, session in enumerate(reversed(recent), 1):
                 date = session["date"][:10]
                 count = len(session["practices"])
-                perfect = sum(1 for p in session["practices"] if p["match"])
+                perfect, avg_sim = session_summary(session)
                 
-                with st.expander(f"{date} - {count} practices ({perfect} perfect)"):
-                    for j, practice in enumerate(session["practices"], 1):
-                        status = "✅" if practice["match"] else f"📊 {practice['similarity']:.1%}"
-                        
-                        st.markdown(f"**{j}. {status}**")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.write("Target:", practice['target'])
-                            if "correct_phonemes" in practice:
-                                st.write("Correct eIPA:", practice['correct_phonemes'])
-                            if "correct_ipa" in practice and practice["correct_ipa"]:
-                                st.write("Correct IPA:", practice['correct_ipa'])
-                        
-                        with col2:
-                            st.write("Recognized:", practice['recognized'])
-                            if "user_phonemes" in practice:
-                                st.write("Your eIPA:", practice['user_phonemes'])
-                            if "user_ipa" in practice and practice["user_ipa"]:
-                                st.write("Your IPA:", practice['user_ipa'])
-                        
-                        st.markdown("---")
+                with st.expander(f"{date} - {count} practices ({perfect} perfect, {avg_sim:.0%} avg)"):
+                    # One dataframe per session instead of a dozen widgets per practice
+                    df = pd.DataFrame(session["practices"])
+                    if "exact_match" in df:
+                        # Sessions saved by app.py / streamlit_app_v2.py
+                        df["match"] = df["match"].fillna(df["exact_match"]) if "match" in df else df["exact_match"]
+                    df = df.reindex(columns=HISTORY_COLUMNS)
+                    st.dataframe(df, use_container_width=True, hide_index=True)
 
 
 if __name__ == "__main__":
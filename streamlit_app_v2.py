@@ -6,32 +6,64 @@ Run with: streamlit run streamlit_app_v2.py
 """
 
 import streamlit as st
-import json
+import io
+import orjson
 import warnings
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Tuple
+import functools
+import importlib.util
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
-import tempfile
 import os
+import string
+import ctypes
+import ctypes.util
+import threading
 
 # Environment configuration
 IS_LOCAL_DEV = os.path.exists('./local/bin/run-espeak-ng')  # True if local eSpeak build exists
 
+# Where Whisper weights are downloaded; point at a persistent volume so
+# Streamlit Cloud restarts don't re-download them (None = library default)
+WHISPER_DOWNLOAD_ROOT = os.environ.get("WHISPER_DOWNLOAD_ROOT")
+
+# Strips punctuation when comparing target and recognized text
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
 # Suppress warnings
 warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")  # Whisper on CPU
 warnings.filterwarnings("ignore", message="urllib3 v2 only supports OpenSSL")  # LibreSSL compatibility
 
+# whisper (torch), gtts and soundfile are imported where they are used, so
+# the Statistics/History tabs render without paying for them
 try:
-    import whisper
-    import soundfile as sf
     import numpy as np
-    from gtts import gTTS
 except ImportError as e:
     st.error(f"Error: {e}")
     st.error("Please activate the virtual environment and install dependencies")
     st.stop()
 
+# RapidFuzz C implementation of edit distance (optional, falls back to pure Python)
+try:
+    from rapidfuzz.distance import Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# WebRTC voice activity detector for silence trimming (optional, falls back to energy trim)
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+# faster-whisper is imported where the model is loaded; only whether it is
+# installed matters up front (it makes the INT8 quantization setting moot)
+FASTER_WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+
 # CCS Testing Framework (optional)
 try:
     from ccs_test_integration import CCSTestSession
@@ -60,14 +92,14 @@ def load_settings():
         "comparison_algorithm": "edit_distance",  # or "positional"
         "asr_engine": "whisper",  # "whisper" or "wav2vec2"
         "whisper_model_size": "base",  # tiny, base, small, medium, large
+        "quantize_whisper": True,  # INT8 dynamic quantization for openai-whisper on CPU
         "silence_threshold": 0.01,  # Energy threshold for silence detection (0.001-0.1)
     }
     
     if config_file.exists():
         try:
-            with open(config_file) as f:
-                saved = json.load(f)
-                default_settings.update(saved)
+            saved = orjson.loads(config_file.read_bytes())
+            default_settings.update(saved)
         except Exception:
             pass
     
@@ -77,29 +109,107 @@ def load_settings():
 def save_settings(settings: Dict):
     """Save settings to config file"""
     try:
-        with open("practice_config.json", 'w') as f:
-            json.dump(settings, f, indent=2)
+        with open("practice_config.json", 'wb') as f:
+            f.write(orjson.dumps(settings, option=orjson.OPT_INDENT_2))
     except Exception as e:
         st.error(f"Could not save settings: {e}")
 
 
+HISTORY_FILE = Path("practice_history.jsonl")  # One session per line, append-only
+LEGACY_HISTORY_FILE = Path("practice_history.json")
+STATS_FILE = Path("practice_stats.json")  # Running totals (same format as streamlit_app.py)
+RECENT_SESSIONS = 10  # Sessions shown in the History tab
+
+
 def load_history():
-    """Load practice history"""
-    history_file = Path("practice_history.json")
-    if history_file.exists():
+    """
+    Load the most recent sessions of the practice history
+    
+    Only the last RECENT_SESSIONS lines are parsed; all-time figures come
+    from the running totals in STATS_FILE.
+    """
+    try:
+        if not HISTORY_FILE.exists() and LEGACY_HISTORY_FILE.exists():
+            # Convert the old single-list JSON history once
+            history = orjson.loads(LEGACY_HISTORY_FILE.read_bytes())
+            HISTORY_FILE.write_bytes(b"".join(orjson.dumps(s) + b"\n" for s in history))
+            return history[-RECENT_SESSIONS:]
+        if HISTORY_FILE.exists():
+            with open(HISTORY_FILE, 'rb') as f:
+                recent = deque((line for line in f if line.strip()), maxlen=RECENT_SESSIONS)
+            return [orjson.loads(line) for line in recent]
+    except Exception:
+        return []
+    return []
+
+
+def session_summary(session: Dict):
+    """(perfect count, average similarity), from the stored aggregates when present"""
+    if "_perfect" in session:
+        return session["_perfect"], session["_avg_sim"]
+    practices = session["practices"]
+    perfect, sim_sum = 0, 0.0
+    for p in practices:  # One pass for both aggregates
+        perfect += bool(p.get("exact_match", p.get("match", False)))
+        sim_sum += p.get("similarity", 0.0)
+    return perfect, sim_sum / len(practices) if practices else 0.0
+
+
+def add_session_to_stats(stats: Dict, session: Dict):
+    """Fold one saved session into the running history totals"""
+    count = len(session["practices"])
+    perfect, avg_sim = session_summary(session)
+    stats["n_sessions"] += 1
+    stats["total_practices"] += count
+    stats["total_perfect"] += perfect
+    stats["sum_similarity"] += avg_sim * count
+    stats["last_date"] = session["date"]
+
+
+def load_stats() -> Dict:
+    """Load running history totals, rebuilding them from the history file if missing"""
+    if STATS_FILE.exists():
         try:
-            with open(history_file) as f:
-                return json.load(f)
+            return orjson.loads(STATS_FILE.read_bytes())
         except Exception:
-            return []
-    return []
+            pass
+    
+    stats = {
+        "n_sessions": 0,
+        "total_practices": 0,
+        "total_perfect": 0,
+        "sum_similarity": 0.0,
+        "last_date": None
+    }
+    try:
+        if HISTORY_FILE.exists():
+            with open(HISTORY_FILE, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        add_session_to_stats(stats, orjson.loads(line))
+    except Exception:
+        pass
+    return stats
+
 
+def write_stats(stats: Dict):
+    """Replace STATS_FILE atomically, so a crash mid-write can't truncate it"""
+    tmp = STATS_FILE.with_name(f"{STATS_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, STATS_FILE)
 
-def save_history(history: List[Dict]):
-    """Save practice history"""
+
+def save_history(session: Dict, stats: Dict):
+    """Append one session to the practice history and update the running totals"""
     try:
-        with open("practice_history.json", 'w') as f:
-            json.dump(history, f, indent=2)
+        # Other browser sessions and app.py also advance the totals: start from
+        # the file, read before appending so a rebuild doesn't count this session
+        stats.clear()
+        stats.update(load_stats())
+        with open(HISTORY_FILE, 'ab') as f:
+            f.write(orjson.dumps(session) + b"\n")
+        add_session_to_stats(stats, session)
+        write_stats(stats)
     except Exception as e:
         st.error(f"Could not save history: {e}")
 
@@ -112,6 +222,9 @@ def initialize_session_state():
     if 'history' not in st.session_state:
         st.session_state.history = load_history()
     
+    if 'stats' not in st.session_state:
+        st.session_state.stats = load_stats()
+    
     if 'current_session' not in st.session_state:
         st.session_state.current_session = {
             "date": datetime.now().isoformat(),
@@ -127,44 +240,99 @@ def initialize_session_state():
     if 'audio_input_key' not in st.session_state:
         st.session_state.audio_input_key = 0
     
-    if 'whisper_model' not in st.session_state:
-        st.session_state.whisper_model = None
-        st.session_state.whisper_model_name = None
-    
-    if 'wav2vec2_processor' not in st.session_state:
-        st.session_state.wav2vec2_processor = None
-        st.session_state.wav2vec2_model = None
-    
     # CCS Testing Framework initialization (disabled by default)
     if CCS_AVAILABLE and 'ccs_test' not in st.session_state:
         st.session_state.ccs_test = CCSTestSession(enabled=False)
 
 
-def get_whisper_model(model_name: str):
-    """Load or get cached Whisper model"""
-    if st.session_state.whisper_model_name != model_name:
-        with st.spinner(f"Loading Whisper model '{model_name}'..."):
-            st.session_state.whisper_model = whisper.load_model(model_name)
-            st.session_state.whisper_model_name = model_name
-    return st.session_state.whisper_model
+def whisper_model_cached(model_name: str) -> bool:
+    """Check (locally, without network) whether the Whisper weights are already downloaded"""
+    try:
+        from faster_whisper.utils import download_model
+    except ImportError:
+        default_root = os.path.join(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"), "whisper")
+        try:
+            import whisper
+            # Aliases are saved under their URL's file name ("large" -> large-v3.pt)
+            file_name = os.path.basename(whisper._MODELS[model_name])
+        except (ImportError, KeyError):
+            file_name = f"{model_name}.pt"
+        return (Path(WHISPER_DOWNLOAD_ROOT or default_root) / file_name).exists()
+    try:
+        download_model(model_name, local_files_only=True, cache_dir=WHISPER_DOWNLOAD_ROOT)
+        return True
+    except Exception:
+        return False
+
+
+def quantize_whisper_model(model):
+    """
+    Apply INT8 dynamic quantization to an openai-whisper model's linear layers (CPU only)
+    
+    Whisper wraps its layers in a Linear subclass (casting weights to the input
+    dtype for FP16), which quantize_dynamic doesn't recognize; on CPU the model
+    runs in FP32, so they can be treated as plain nn.Linear first.
+    """
+    import torch
+    import whisper.model
+    if next(model.parameters()).device.type != "cpu":
+        return model  # Dynamic quantization kernels are CPU-only
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+@st.cache_resource(show_spinner="Loading Whisper model...")
+def get_whisper_model(model_name: str, quantize: bool = True):
+    """
+    Load Whisper model once and share it across all sessions
+    
+    Uses faster-whisper (CTranslate2, INT8) when installed - several times faster
+    than openai-whisper's FP32 PyTorch on CPU - and falls back to openai-whisper,
+    quantized to INT8 on CPU unless quantize is False.
+    """
+    downloaded = whisper_model_cached(model_name)
+    # Cleared after loading, so replaying this cached call on later hits shows nothing
+    notice = st.empty()
+    if not downloaded:
+        notice.warning(f"First use of the '{model_name}' model: downloading weights, this can take a few minutes...")
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        import whisper
+        model = whisper.load_model(model_name, download_root=WHISPER_DOWNLOAD_ROOT)
+        if quantize:
+            model = quantize_whisper_model(model)
+    else:
+        # Skip the Hugging Face Hub revision check when the weights are already on disk
+        model = WhisperModel(
+            model_name, device="auto", compute_type="int8",
+            download_root=WHISPER_DOWNLOAD_ROOT,
+            local_files_only=downloaded
+        )
+    notice.empty()
+    return model
+
+
+@st.cache_resource(show_spinner="Loading wav2vec2 Portuguese model (first time may take a few minutes)...")
+def load_wav2vec2_model():
+    """Load the wav2vec2 Portuguese model once and share it across all sessions"""
+    from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+    model_name = "jonatasgrosman/wav2vec2-large-xlsr-53-portuguese"
+    return Wav2Vec2Processor.from_pretrained(model_name), Wav2Vec2ForCTC.from_pretrained(model_name)
 
 
 def get_wav2vec2_model():
-    """Load or get cached wav2vec2 Portuguese model"""
-    if 'wav2vec2_processor' not in st.session_state or st.session_state.wav2vec2_processor is None:
-        try:
-            with st.spinner("Loading wav2vec2 Portuguese model (first time may take a few minutes)..."):
-                from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
-                model_name = "jonatasgrosman/wav2vec2-large-xlsr-53-portuguese"
-                st.session_state.wav2vec2_processor = Wav2Vec2Processor.from_pretrained(model_name)
-                st.session_state.wav2vec2_model = Wav2Vec2ForCTC.from_pretrained(model_name)
-        except ImportError:
-            st.error("wav2vec2 requires 'transformers' and 'torch'. Install with: pip install transformers torch")
-            return None, None
-        except Exception as e:
-            st.error(f"Failed to load wav2vec2 model: {e}")
-            return None, None
-    return st.session_state.wav2vec2_processor, st.session_state.wav2vec2_model
+    """Get the shared wav2vec2 Portuguese model, or (None, None) if it can't be loaded"""
+    try:
+        return load_wav2vec2_model()
+    except ImportError:
+        st.error("wav2vec2 requires 'transformers' and 'torch'. Install with: pip install transformers torch")
+        return None, None
+    except Exception as e:
+        st.error(f"Failed to load wav2vec2 model: {e}")
+        return None, None
 
 
 def get_espeak_path():
@@ -176,8 +344,89 @@ def get_espeak_path():
     return "espeak-ng"
 
 
+# libespeak-ng constants (see src/include/espeak-ng/speak_lib.h)
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+espeakCHARS_UTF8 = 1
+espeakPHONEMES_IPA = 0x02
+espeakINITIALIZE_DONT_EXIT = 0x8000
+
+_espeak_lib = None
+_espeak_voice = None
+_espeak_lock = threading.Lock()
+
+
+def _load_libespeak():
+    """Load libespeak-ng once (local build first, then system-wide), or None"""
+    global _espeak_lib
+    if _espeak_lib is not None:
+        return _espeak_lib or None
+
+    candidates = [
+        "./local/lib/libespeak-ng.so.1",
+        "./local/lib/libespeak-ng.dylib",
+        ctypes.util.find_library("espeak-ng"),
+    ]
+    for path in filter(None, candidates):
+        if path.startswith("./") and not Path(path).exists():
+            continue
+        try:
+            lib = ctypes.CDLL(path)
+        except OSError:
+            continue
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        lib.espeak_TextToPhonemes.argtypes = [ctypes.POINTER(ctypes.c_char_p), ctypes.c_int, ctypes.c_int]
+        lib.espeak_TextToPhonemes.restype = ctypes.c_char_p
+        # Without DONT_EXIT the library calls exit() when espeak-ng-data is
+        # missing; with it, a broken install surfaces as a failed voice
+        # selection below and we fall back to the CLI
+        if lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, None, espeakINITIALIZE_DONT_EXIT) > 0:
+            _espeak_lib = lib
+            return lib
+
+    _espeak_lib = False  # Don't retry on every call
+    return None
+
+
+def _text_to_phonemes(text: str, voice: str, *phoneme_modes: int):
+    """
+    Phonemize text in-process with libespeak-ng, once per requested phoneme mode,
+    all under a single voice selection.
+    Returns a list (one string per mode), or None if the library is unavailable
+    so callers can fall back to the CLI.
+    """
+    global _espeak_voice
+    lib = _load_libespeak()
+    if lib is None:
+        return None
+
+    # The library keeps global translator state, so serialize access
+    with _espeak_lock:
+        if voice != _espeak_voice:
+            if lib.espeak_SetVoiceByName(voice.encode()) != 0:
+                return None
+            _espeak_voice = voice
+
+        results = []
+        for phoneme_mode in phoneme_modes:
+            buffer = ctypes.create_string_buffer(text.encode("utf-8"))
+            text_ptr = ctypes.cast(buffer, ctypes.c_char_p)
+            clauses = []
+            # Each call translates one clause and advances text_ptr (NULL at the end)
+            while text_ptr.value:
+                phonemes = lib.espeak_TextToPhonemes(ctypes.byref(text_ptr), espeakCHARS_UTF8, phoneme_mode)
+                if phonemes:
+                    clauses.append(phonemes.decode("utf-8").strip())
+            results.append(" ".join(c for c in clauses if c))
+        return results
+
+
+@st.cache_data(show_spinner=False, max_entries=4096)
 def get_phonemes(text: str, voice: str = "pt-br") -> str:
     """Get eSpeak phoneme codes (eIPA) for text"""
+    phonemes = _text_to_phonemes(text, voice, 0)
+    if phonemes is not None:
+        return phonemes[0]
     try:
         result = subprocess.run(
             [get_espeak_path(), "-v", voice, "-x", "-q", text],
@@ -190,8 +439,12 @@ def get_phonemes(text: str, voice: str = "pt-br") -> str:
         return "[phonemes unavailable]"
 
 
+@st.cache_data(show_spinner=False, max_entries=4096)
 def get_ipa(text: str, voice: str = "pt-br") -> str:
     """Get IPA transcription for text"""
+    ipa = _text_to_phonemes(text, voice, espeakPHONEMES_IPA)
+    if ipa is not None:
+        return ipa[0]
     try:
         result = subprocess.run(
             [get_espeak_path(), "-v", voice, "--ipa", "-q", text],
@@ -204,6 +457,41 @@ def get_ipa(text: str, voice: str = "pt-br") -> str:
         return "[IPA unavailable]"
 
 
+@st.cache_data(show_spinner=False, max_entries=4096)
+def phonemize(text: str, voice: str = "pt-br") -> Tuple[str, str]:
+    """Get (eIPA, IPA) for text with one voice selection instead of two separate lookups"""
+    both = _text_to_phonemes(text, voice, 0, espeakPHONEMES_IPA)
+    if both is not None:
+        return both[0], both[1]
+    # CLI fallback: espeak-ng prints one format per run, so run both processes at once
+    try:
+        processes = [
+            subprocess.Popen(
+                [get_espeak_path(), "-v", voice, flag, "-q", text],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            for flag in ("-x", "--ipa")
+        ]
+    except FileNotFoundError:
+        return "[phonemes unavailable]", "[IPA unavailable]"
+    outputs = []
+    for process, unavailable in zip(processes, ("[phonemes unavailable]", "[IPA unavailable]")):
+        stdout, _ = process.communicate()
+        outputs.append(stdout.strip() if process.returncode == 0 else unavailable)
+    return outputs[0], outputs[1]
+
+
+def get_target_artifacts(text: str, voice: str) -> Tuple[str, str]:
+    """Get (eIPA, IPA) for a practice target; retries of the same phrase hit phonemize's cache"""
+    artifacts = phonemize(text, voice)
+    # Don't keep a failed lookup cached: the next retry runs eSpeak again
+    if "[phonemes unavailable]" in artifacts or "[IPA unavailable]" in artifacts:
+        phonemize.clear(text, voice)
+    return artifacts
+
+
 def speak_text(text: str, voice: str = "pt-br", speed: int = 160, pitch: int = 40):
     """Speak Portuguese text using eSpeak (local only)"""
     try:
@@ -218,43 +506,93 @@ def speak_text(text: str, voice: str = "pt-br", speed: int = 160, pitch: int = 4
         pass  # Silently fail if espeak not available
 
 
+@st.cache_data(show_spinner=False, ttl=86400, max_entries=512)  # Same phrase, same audio: keep for a day
 def speak_text_gtts(text: str, lang: str = "pt-br") -> bytes:
     """
     Generate speech using Google TTS (higher quality than eSpeak)
     Returns audio bytes for playback in Streamlit
     """
+    from gtts import gTTS
+    
     # Use 'pt' for Portuguese (gTTS auto-detects Brazilian vs European)
     tts = gTTS(text=text, lang=lang.replace('-br', ''), slow=False)
     
-    # Save to temporary file and read back
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-        tts.save(fp.name)
-        with open(fp.name, 'rb') as audio_file:
-            audio_bytes = audio_file.read()
-        Path(fp.name).unlink()  # Clean up temp file
+    # Write the MP3 straight into memory
+    buffer = io.BytesIO()
+    tts.write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """
+    One worker pool shared by all sessions for espeak and gTTS calls
+    (cached so script reruns don't spawn a new pool each time)
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="practice")
+
+
+def prefetch_target(text: str, voice: str) -> Dict:
+    """
+    Start target phonemes/IPA and gTTS audio in the background
     
-    return audio_bytes
+    Runs once per (text, voice); the futures are kept in session state so the
+    Check step and the target audio player just collect the results, which are
+    usually ready while the user is still recording.
+    """
+    prefetch = st.session_state.get('target_prefetch')
+    if prefetch is None or prefetch['key'] != (text, voice):
+        prefetch = {'key': (text, voice)}
+        st.session_state.target_prefetch = prefetch
+    executor = get_executor()
+    for name, fn in (('artifacts', get_target_artifacts), ('tts', speak_text_gtts)):
+        future = prefetch.get(name)
+        # Resubmit a call that failed (e.g. gTTS rate limit) so the next rerun
+        # retries it instead of re-raising the stored exception
+        if future is None or (future.done() and (future.cancelled() or future.exception() is not None)):
+            prefetch[name] = executor.submit(fn, text, voice)
+    return prefetch
 
 
-def transcribe_audio_whisper(audio_file: str, model):
+def transcribe_audio_whisper(audio: np.ndarray, model):
     """
     Transcribe audio to text using Whisper
     
+    audio: float32 mono samples at 16kHz (Whisper's native input format)
+    
     Note: No initial_prompt is used to avoid biasing the transcription.
     We force Portuguese language detection and use low temperature for consistency.
     CRITICAL: language="pt" should FORCE Portuguese, but Whisper can still drift.
     """
-    result = model.transcribe(
-        audio=audio_file,
-        language="pt",  # Force Portuguese (ISO 639-1 code) - should be absolute
-        task="transcribe",
-        temperature=0.0,  # Deterministic output
-        no_speech_threshold=0.6,  # Higher threshold to reject non-speech (like beeps)
-        logprob_threshold=-1.0,   # Stricter on low-confidence segments
-        condition_on_previous_text=False,  # Don't use context from previous segments
-        word_timestamps=False,  # Disable word-level timestamps to reduce space insertion
-        compression_ratio_threshold=2.4  # Default is 2.4, keep it strict
-    )
+    if type(model).__module__.startswith("faster_whisper"):
+        segments, info = model.transcribe(
+            audio,
+            language="pt",
+            task="transcribe",
+            beam_size=1,  # Greedy decoding, same as openai-whisper at temperature 0
+            temperature=0.0,
+            no_speech_threshold=0.6,
+            log_prob_threshold=-1.0,
+            condition_on_previous_text=False,
+            word_timestamps=False,
+            without_timestamps=True,  # Short clips: skip timestamp tokens in the decoder
+            compression_ratio_threshold=2.4,
+            vad_filter=True  # Silero VAD drops leftover silence/noise before decoding
+        )
+        text = "".join(segment.text for segment in segments)
+        result = {"text": text, "language": info.language}
+    else:
+        result = model.transcribe(
+            audio=audio,
+            language="pt",  # Force Portuguese (ISO 639-1 code) - should be absolute
+            task="transcribe",
+            temperature=0.0,  # Deterministic output
+            no_speech_threshold=0.6,  # Higher threshold to reject non-speech (like beeps)
+            logprob_threshold=-1.0,   # Stricter on low-confidence segments
+            condition_on_previous_text=False,  # Don't use context from previous segments
+            word_timestamps=False,  # Disable word-level timestamps to reduce space insertion
+            compression_ratio_threshold=2.4  # Default is 2.4, keep it strict
+        )
     
     # Double-check detected language (Whisper should respect language="pt" but doesn't always)
     detected_lang = result.get("language", "unknown")
@@ -266,21 +604,14 @@ def transcribe_audio_whisper(audio_file: str, model):
     return result["text"].strip().lower()
 
 
-def transcribe_audio_wav2vec2(audio_file: str, processor, model):
+def transcribe_audio_wav2vec2(speech: np.ndarray, processor, model):
     """
     Transcribe audio to text using wav2vec2 Portuguese model
+    
+    speech: float32 mono samples at 16kHz (what wav2vec2 expects)
     """
     try:
         import torch
-        import soundfile as sf
-        
-        # Load audio
-        speech, sample_rate = sf.read(audio_file)
-        
-        # Resample if needed (wav2vec2 expects 16kHz)
-        if sample_rate != 16000:
-            import librosa
-            speech = librosa.resample(speech, orig_sr=sample_rate, target_sr=16000)
         
         # Process
         inputs = processor(speech, sampling_rate=16000, return_tensors="pt", padding=True)
@@ -298,9 +629,9 @@ def transcribe_audio_wav2vec2(audio_file: str, processor, model):
         return ""
 
 
-def transcribe_audio(audio_file: str, settings: Dict):
+def transcribe_audio(audio: np.ndarray, settings: Dict):
     """
-    Transcribe audio using the selected ASR engine
+    Transcribe 16kHz mono audio using the selected ASR engine
     """
     asr_engine = settings.get('asr_engine', 'whisper')
     
@@ -310,12 +641,15 @@ def transcribe_audio(audio_file: str, settings: Dict):
             st.warning("wav2vec2 unavailable, falling back to Whisper")
             asr_engine = 'whisper'
         else:
-            return transcribe_audio_wav2vec2(audio_file, processor, model)
+            return transcribe_audio_wav2vec2(audio, processor, model)
     
     # Default to Whisper
     model_size = settings.get('whisper_model_size', 'base')
-    model = get_whisper_model(model_size)
-    return transcribe_audio_whisper(audio_file, model)
+    # quantize is part of the cache key: keep it False where it does nothing, so
+    # toggling it can't load a second identical faster-whisper model
+    quantize = settings.get('quantize_whisper', True) and not FASTER_WHISPER_AVAILABLE
+    model = get_whisper_model(model_size, quantize)
+    return transcribe_audio_whisper(audio, model)
 
 
 def levenshtein_distance(s1: str, s2: str) -> int:
@@ -323,6 +657,9 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     Calculate Levenshtein (edit) distance between two strings.
     Returns the minimum number of single-character edits (insertions, deletions, substitutions).
     """
+    if RAPIDFUZZ_AVAILABLE:
+        return Levenshtein.distance(s1, s2)
+    
     if len(s1) < len(s2):
         return levenshtein_distance(s2, s1)
     
@@ -349,6 +686,20 @@ def get_edit_operations(s1: str, s2: str):
     Returns a list of tuples: (operation, position, char1, char2)
     where operation is 'match', 'substitute', 'insert', or 'delete'
     """
+    if RAPIDFUZZ_AVAILABLE:
+        # Expand RapidFuzz's alignment blocks into per-character operations
+        operations = []
+        for tag, i1, i2, j1, j2 in Levenshtein.opcodes(s1, s2):
+            if tag == 'equal':
+                operations.extend(('match', i1 + k, s1[i1 + k], s2[j1 + k]) for k in range(i2 - i1))
+            elif tag == 'replace':
+                operations.extend(('substitute', i1 + k, s1[i1 + k], s2[j1 + k]) for k in range(i2 - i1))
+            elif tag == 'insert':
+                operations.extend(('insert', i1, '-', s2[j]) for j in range(j1, j2))
+            elif tag == 'delete':
+                operations.extend(('delete', i, s1[i], '-') for i in range(i1, i2))
+        return operations
+    
     # Build the DP table
     m, n = len(s1), len(s2)
     dp = [[0] * (n + 1) for _ in range(m + 1)]
@@ -392,6 +743,29 @@ def get_edit_operations(s1: str, s2: str):
     return operations
 
 
+@functools.lru_cache(maxsize=256)
+def phoneme_diff(target: str, user: str):
+    """
+    Summarize the alignment between target and user phonemes for display.
+    Memoized because the results panel re-renders on every rerun.
+    
+    Returns:
+        counts: dict of operation -> count ('match', 'substitute', 'insert', 'delete')
+        diffs: tuple of formatted descriptions of every non-matching operation
+    """
+    counts = {'match': 0, 'substitute': 0, 'insert': 0, 'delete': 0}
+    diffs = []
+    for op_type, pos, c1, c2 in get_edit_operations(target, user):
+        counts[op_type] += 1
+        if op_type == 'substitute':
+            diffs.append(f"Position {pos}: `{c1}` → `{c2}` (substitute)")
+        elif op_type == 'insert':
+            diffs.append(f"Position {pos}: inserted `{c2}`")
+        elif op_type == 'delete':
+            diffs.append(f"Position {pos}: deleted `{c1}`")
+    return counts, tuple(diffs)
+
+
 def compare_phonemes_positional(user_phonemes: str, correct_phonemes: str):
     """
     DEPRECATED: Simple positional matching (fails with insertions/deletions).
@@ -401,12 +775,15 @@ def compare_phonemes_positional(user_phonemes: str, correct_phonemes: str):
     
     if len(correct_phonemes) == 0:
         similarity = 0.0
+    elif exact_match:
+        similarity = 1.0
     else:
-        matches = sum(
-            1 for a, b in zip(user_phonemes, correct_phonemes)
-            if a == b
-        )
-        similarity = matches / max(len(user_phonemes), len(correct_phonemes))
+        # Compare code points as uint32 arrays instead of looping per character
+        user_codes = np.frombuffer(user_phonemes.encode('utf-32-le'), dtype=np.uint32)
+        correct_codes = np.frombuffer(correct_phonemes.encode('utf-32-le'), dtype=np.uint32)
+        n = min(len(user_codes), len(correct_codes))
+        matches = int(np.count_nonzero(user_codes[:n] == correct_codes[:n]))
+        similarity = matches / max(len(user_codes), len(correct_codes))
     
     return exact_match, similarity
 
@@ -426,6 +803,9 @@ def compare_phonemes_edit_distance(user_phonemes: str, correct_phonemes: str):
     if len(correct_phonemes) == 0:
         return exact_match, 0.0, len(user_phonemes)
     
+    if exact_match:
+        return True, 1.0, 0
+    
     distance = levenshtein_distance(user_phonemes, correct_phonemes)
     max_length = max(len(user_phonemes), len(correct_phonemes))
     
@@ -458,6 +838,50 @@ def compare_phonemes(user_phonemes: str, correct_phonemes: str, algorithm: str =
         raise ValueError(f"Unknown algorithm: {algorithm}")
 
 
+def trim_silence(audio: np.ndarray, sample_rate: int, silence_threshold: float = 0.01) -> np.ndarray:
+    """
+    Trim leading/trailing non-speech from 16kHz mono float audio
+    
+    Uses the WebRTC VAD classifier on 30ms frames when available, which copes
+    with steady background noise and keeps quiet phonemes like /s/. Otherwise
+    falls back to an energy threshold (silence_threshold = fraction of max energy).
+    """
+    if WEBRTCVAD_AVAILABLE:
+        vad = webrtcvad.Vad(2)  # Aggressiveness 0-3
+        frame_length = int(0.03 * sample_rate)  # 30ms frames
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        n_frames = len(pcm) // frame_length
+        is_speech = np.fromiter(
+            (vad.is_speech(pcm[i * frame_length:(i + 1) * frame_length].tobytes(), sample_rate)
+             for i in range(n_frames)),
+            dtype=np.bool_, count=n_frames
+        )
+        speech_frames = np.flatnonzero(is_speech)
+        padding = 3  # 90ms either side so word onsets/codas aren't clipped
+    else:
+        # Calculate short-term energy over non-overlapping frames in one pass
+        frame_length = int(0.02 * sample_rate)  # 20ms frames
+        n_frames = len(audio) // frame_length
+        frames = audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+        energy = np.einsum('ij,ij->i', frames, frames)
+        speech_frames = np.flatnonzero(energy > silence_threshold * np.max(energy))
+        padding = 2
+    
+    if len(speech_frames) == 0:
+        return audio
+    
+    start_frame = max(0, speech_frames[0] - padding)
+    end_frame = min(n_frames, speech_frames[-1] + 1 + padding)
+    return audio[start_frame * frame_length:end_frame * frame_length]
+
+
+# Result fields kept for the results panel but not written to the history
+RESULT_DISPLAY_ONLY_KEYS = ("user_audio_bytes", "op_summary", "diffs")
+
+# Status line of the detailed phoneme analysis, filled from phoneme_diff's counts
+OP_SUMMARY_TEMPLATE = "📊 {match} matches, {substitute} substitutions, {insert} insertions, {delete} deletions"
+
+
 def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
     """
     Practice a word/phrase using pre-recorded audio
@@ -469,55 +893,40 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
     4. This allows flexible matching while maintaining proper IPA display
     """
     try:
-        # Save audio bytes to temporary file
-        temp_audio = "temp_streamlit_recording.wav"
-        with open(temp_audio, 'wb') as f:
-            f.write(audio_bytes)
+        import soundfile as sf
+        
+        # Decode the recording in memory as float32 mono
+        audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype='float32')
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1)
+        
+        # Resample to 16kHz up front (what Whisper and wav2vec2 expect) so
+        # trimming runs on a third of the samples of a 44.1/48kHz recording
+        if sample_rate != 16000:
+            from scipy.signal import resample_poly
+            audio_data = resample_poly(audio_data, 16000, sample_rate).astype(np.float32)
+            sample_rate = 16000
         
         # Preprocess audio: trim silence/noise from start and end
         # This helps remove system noise and other artifacts
         try:
-            audio_data, sample_rate = sf.read(temp_audio)
-            
-            # Simple energy-based trimming
-            # Calculate short-term energy
-            frame_length = int(0.02 * sample_rate)  # 20ms frames
-            energy = np.array([
-                np.sum(audio_data[i:i+frame_length]**2) 
-                for i in range(0, len(audio_data) - frame_length, frame_length)
-            ])
-            
-            # Find speech boundaries using user-configurable threshold
-            # threshold is a percentage of max energy (default 0.01 = 1%)
-            silence_threshold = settings.get('silence_threshold', 0.01)
-            threshold = silence_threshold * np.max(energy)
-            speech_frames = np.where(energy > threshold)[0]
-            
-            if len(speech_frames) > 0:
-                start_frame = max(0, speech_frames[0] - 2)  # Add 2 frames padding
-                end_frame = min(len(energy), speech_frames[-1] + 3)
-                
-                start_sample = start_frame * frame_length
-                end_sample = end_frame * frame_length
-                
-                trimmed_audio = audio_data[start_sample:end_sample]
-                
-                # Save trimmed audio
-                sf.write(temp_audio, trimmed_audio, sample_rate)
+            audio_data = trim_silence(audio_data, sample_rate, settings.get('silence_threshold', 0.01))
         except Exception as e:
             # If trimming fails, continue with original audio
             pass
         
         # Get correct pronunciation
-        correct_phonemes = get_phonemes(text, settings['voice'])
-        correct_ipa = get_ipa(text, settings['voice'])
+        prefetch = st.session_state.get('target_prefetch')
+        if prefetch and prefetch['key'] == (text, settings['voice']):
+            correct_phonemes, correct_ipa = prefetch['artifacts'].result()
+        else:
+            correct_phonemes, correct_ipa = get_target_artifacts(text, settings['voice'])
         
         # Transcribe user's audio using selected ASR engine
-        recognized_text = transcribe_audio(temp_audio, settings)
+        recognized_text = transcribe_audio(audio_data, settings)
         
         # Get phonemes with proper spacing (for display)
-        user_phonemes = get_phonemes(recognized_text, settings['voice'])
-        user_ipa = get_ipa(recognized_text, settings['voice'])
+        user_phonemes, user_ipa = phonemize(recognized_text, settings['voice'])
         
         # For comparison: normalize by removing spaces from PHONEMES, not text
         # This allows flexible matching while preserving word boundaries in display
@@ -533,8 +942,13 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
             algorithm=algorithm
         )
         
-        # Keep the original recording for playback
-        # (Don't delete temp_audio - we'll save it in the result)
+        # Alignment summary for the detailed analysis panel, computed once here
+        # rather than on every rerun of the results panel
+        if correct_phonemes_normalized == user_phonemes_normalized:
+            op_summary, diffs = None, ()
+        else:
+            op_counts, diffs = phoneme_diff(correct_phonemes_normalized, user_phonemes_normalized)
+            op_summary = OP_SUMMARY_TEMPLATE.format_map(op_counts)
         
         result = {
             "target": text,
@@ -548,11 +962,13 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
             "edit_distance": edit_distance,
             "correct_phonemes_normalized": correct_phonemes_normalized,
             "user_phonemes_normalized": user_phonemes_normalized,
+            "op_summary": op_summary,
+            "diffs": diffs,
             "user_audio_bytes": audio_bytes  # Keep in session for playback, but don't save to JSON
         }
         
-        # Save to current session (exclude bytes for JSON serialization)
-        session_data = {k: v for k, v in result.items() if k != "user_audio_bytes"}
+        # Save to current session (exclude bytes and display-only fields from the JSON history)
+        session_data = {k: v for k, v in result.items() if k not in RESULT_DISPLAY_ONLY_KEYS}
         st.session_state.current_session["practices"].append({
             "time": datetime.now().isoformat(),
             **session_data
@@ -572,8 +988,11 @@ def practice_word_from_audio(text: str, audio_bytes: bytes, settings: Dict):
 def save_current_session():
     """Save current session to history"""
     if st.session_state.current_session["practices"]:
-        st.session_state.history.append(st.session_state.current_session)
-        save_history(st.session_state.history)
+        # Sessions are immutable once saved, so store their aggregates inline
+        session = st.session_state.current_session
+        session["_perfect"], session["_avg_sim"] = session_summary(session)
+        st.session_state.history.append(session)
+        save_history(session, st.session_state.stats)
         
         # Reset current session
         st.session_state.current_session = {
@@ -586,6 +1005,136 @@ def save_current_session():
         st.warning("No practices in current session to save")
 
 
+@st.fragment
+def render_results(result: Dict):
+    """
+    Results panel for the last practice
+    
+    A fragment, so its own widgets (the detailed-analysis checkbox and the
+    eSpeak buttons) rerun only this panel instead of the whole page.
+    """
+    if result["exact_match"]:
+        st.success("🎉 PERFECT MATCH! Well done!")
+    else:
+        score_col1, score_col2 = st.columns([2, 1])
+        with score_col1:
+            st.info(f"📊 Score: {result['similarity']:.1%}")
+        with score_col2:
+            if result.get('edit_distance') is not None:
+                st.metric("Edit Distance", result['edit_distance'],
+                        help="Number of edits needed to match target")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Target")
+        st.write(f"**Text:** {result['target']}")
+        st.write(f"**eIPA:** {result['correct_phonemes']}")
+        if result.get('correct_ipa'):
+            st.write(f"**IPA:** {result['correct_ipa']}")
+        
+        # Show target audio directly
+        st.write("🔊 **Google TTS:**")
+        audio_bytes = speak_text_gtts(result['target'], st.session_state.settings['voice'])
+        st.audio(audio_bytes, format='audio/mp3')
+    
+    with col2:
+        st.subheader("Your Pronunciation")
+        st.write(f"**Recognized:** {result['recognized']}")
+        st.write(f"**eIPA:** {result['user_phonemes']}")
+        if result.get('user_ipa'):
+            st.write(f"**IPA:** {result['user_ipa']}")
+        
+        # Show comparison note
+        # Normalize text by removing punctuation for comparison
+        target_clean = result['target'].lower().translate(PUNCTUATION_TABLE)
+        recognized_clean = result['recognized'].translate(PUNCTUATION_TABLE)
+        
+        # Phonemes with spaces removed, as compared by practice_word_from_audio
+        target_norm = result['correct_phonemes_normalized']
+        user_norm = result['user_phonemes_normalized']
+        
+        # Only show messages if there are meaningful differences
+        phonemes_match = target_norm == user_norm
+        text_matches = target_clean == recognized_clean
+        score_is_high = result['similarity'] >= 0.95
+        
+        if phonemes_match and result['correct_phonemes'] != result['user_phonemes']:
+            st.success("✅ Phonemes match perfectly (spacing differences ignored)")
+        elif not text_matches and not score_is_high:
+            # Only warn if BOTH text differs AND score is low
+            st.warning("⚠️ Different words recognized - try speaking more clearly")
+        elif score_is_high and not text_matches:
+            # High score but text differs (e.g., punctuation) - show positive message
+            st.info("ℹ️ Excellent pronunciation! (Minor text differences ignored)")
+        
+        # Show detailed phoneme analysis (works with edit distance!)
+        if st.checkbox("🔍 Show detailed phoneme analysis", key="show_detail"):
+            st.markdown("#### Phoneme Analysis")
+            st.write(f"**Algorithm:** {st.session_state.settings.get('comparison_algorithm', 'edit_distance')}")
+            
+            if result.get('edit_distance') is not None:
+                st.write(f"**Edit Distance:** {result['edit_distance']} edit(s) needed")
+            
+            st.write("**Normalized phonemes (spaces removed for comparison):**")
+            col_a, col_b = st.columns(2)
+            with col_a:
+                st.code(target_norm, language=None)
+                st.caption(f"Target ({len(target_norm)} chars)")
+            with col_b:
+                st.code(user_norm, language=None)
+                st.caption(f"Yours ({len(user_norm)} chars)")
+            
+            # Visual comparison
+            if phonemes_match:
+                st.success("🎯 Phonemes are identical!")
+            else:
+                if 'op_summary' in result:
+                    op_summary, diffs = result['op_summary'], result['diffs']
+                else:  # Result from before these were stored
+                    counts, diffs = phoneme_diff(target_norm, user_norm)
+                    op_summary = OP_SUMMARY_TEMPLATE.format_map(counts)
+                
+                st.info(op_summary)
+                
+                if diffs:
+                    st.write("**Key differences (first 5):**")
+                    for diff in diffs[:5]:
+                        st.write(f"• {diff}")
+                
+                if len(diffs) > 5:
+                    st.caption(f"... and {len(diffs) - 5} more differences")
+        
+        # Show your recording directly
+        if result.get('user_audio_bytes'):
+            st.write("🔊 **Your recording:**")
+            st.audio(result['user_audio_bytes'], format='audio/wav')
+        
+        # Show TTS of what was recognized (if different)
+        if result['recognized'] != result['target']:
+            st.write("🔊 **Recognized text (TTS):**")
+            audio_bytes = speak_text_gtts(result['recognized'], st.session_state.settings['voice'])
+            st.audio(audio_bytes, format='audio/mp3')
+    
+    # Optional: Hear eSpeak phoneme pronunciation (local development only)
+    if IS_LOCAL_DEV and not result["exact_match"]:
+        st.markdown("---")
+        st.subheader("Compare Phoneme Sounds (eSpeak)")
+        st.caption("🔧 Development feature - requires local audio device")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🔊 Correct Phonemes", key="phoneme_correct"):
+                speak_text(result['target'], 
+                         voice=st.session_state.settings['voice'],
+                         speed=st.session_state.settings['speed'],
+                         pitch=st.session_state.settings['pitch'])
+        with col2:
+            if st.button("🔊 Your Phonemes", key="phoneme_yours"):
+                speak_text(result['recognized'],
+                         voice=st.session_state.settings['voice'],
+                         speed=st.session_state.settings['speed'],
+                         pitch=st.session_state.settings['pitch'])
+
+
 def main():
     """Main Streamlit app"""
     initialize_session_state()
@@ -636,6 +1185,12 @@ def main():
             )
             # Keep 'model' in sync for backwards compatibility
             st.session_state.settings['model'] = st.session_state.settings['whisper_model_size']
+            st.session_state.settings['quantize_whisper'] = st.checkbox(
+                "INT8 quantization",
+                value=st.session_state.settings.get('quantize_whisper', True),
+                disabled=FASTER_WHISPER_AVAILABLE,
+                help="Only used when faster-whisper isn't installed: quantizes openai-whisper to INT8 on CPU (about 2x faster, slightly less accurate)"
+            )
         else:
             st.caption("Using wav2vec2-large-xlsr-53-portuguese")
         
@@ -655,7 +1210,7 @@ def main():
             value=st.session_state.settings.get('silence_threshold', 0.01),
             step=0.001,
             format="%.3f",
-            help="Lower = more aggressive trimming (may cut speech). Higher = keep more audio (may include noise). Default: 0.01"
+            help="Lower = more aggressive trimming (may cut speech). Higher = keep more audio (may include noise). Default: 0.01. Only used when webrtcvad is not installed."
         )
         
         if st.button("💾 Save Settings"):
@@ -893,8 +1448,9 @@ def main():
         if text:
             # Show target audio directly - one click to play
             st.write("🎯 **Target pronunciation:**")
+            prefetch = prefetch_target(text, st.session_state.settings['voice'])
             with st.spinner("Generating audio..."):
-                audio_bytes = speak_text_gtts(text, st.session_state.settings['voice'])
+                audio_bytes = prefetch['tts'].result()
                 st.audio(audio_bytes, format='audio/mp3', autoplay=False)
             
             st.markdown("---")
@@ -931,147 +1487,7 @@ def main():
         if st.session_state.last_result:
             st.markdown("---")
             st.header("Results")
-            result = st.session_state.last_result
-            
-            if result["exact_match"]:
-                st.success("🎉 PERFECT MATCH! Well done!")
-            else:
-                score_col1, score_col2 = st.columns([2, 1])
-                with score_col1:
-                    st.info(f"📊 Score: {result['similarity']:.1%}")
-                with score_col2:
-                    if result.get('edit_distance') is not None:
-                        st.metric("Edit Distance", result['edit_distance'],
-                                help="Number of edits needed to match target")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.subheader("Target")
-                st.write(f"**Text:** {result['target']}")
-                st.write(f"**eIPA:** {result['correct_phonemes']}")
-                if result.get('correct_ipa'):
-                    st.write(f"**IPA:** {result['correct_ipa']}")
-                
-                # Show target audio directly
-                st.write("🔊 **Google TTS:**")
-                audio_bytes = speak_text_gtts(result['target'], st.session_state.settings['voice'])
-                st.audio(audio_bytes, format='audio/mp3')
-            
-            with col2:
-                st.subheader("Your Pronunciation")
-                st.write(f"**Recognized:** {result['recognized']}")
-                st.write(f"**eIPA:** {result['user_phonemes']}")
-                if result.get('user_ipa'):
-                    st.write(f"**IPA:** {result['user_ipa']}")
-                
-                # Show comparison note
-                # Normalize text by removing punctuation for comparison
-                import string
-                target_clean = result['target'].lower().translate(str.maketrans('', '', string.punctuation))
-                recognized_clean = result['recognized'].translate(str.maketrans('', '', string.punctuation))
-                
-                correct_phonemes_no_space = result['correct_phonemes'].replace(" ", "")
-                user_phonemes_no_space = result['user_phonemes'].replace(" ", "")
-                
-                # Only show messages if there are meaningful differences
-                phonemes_match = correct_phonemes_no_space == user_phonemes_no_space
-                text_matches = target_clean == recognized_clean
-                score_is_high = result['similarity'] >= 0.95
-                
-                if phonemes_match and result['correct_phonemes'] != result['user_phonemes']:
-                    st.success("✅ Phonemes match perfectly (spacing differences ignored)")
-                elif not text_matches and not score_is_high:
-                    # Only warn if BOTH text differs AND score is low
-                    st.warning("⚠️ Different words recognized - try speaking more clearly")
-                elif score_is_high and not text_matches:
-                    # High score but text differs (e.g., punctuation) - show positive message
-                    st.info("ℹ️ Excellent pronunciation! (Minor text differences ignored)")
-                
-                # Show detailed phoneme analysis (works with edit distance!)
-                if st.checkbox("🔍 Show detailed phoneme analysis", key="show_detail"):
-                    st.markdown("#### Phoneme Analysis")
-                    st.write(f"**Algorithm:** {st.session_state.settings.get('comparison_algorithm', 'edit_distance')}")
-                    
-                    if result.get('edit_distance') is not None:
-                        st.write(f"**Edit Distance:** {result['edit_distance']} edit(s) needed")
-                    
-                    st.write("**Normalized phonemes (spaces removed for comparison):**")
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        st.code(result.get('correct_phonemes_normalized', correct_phonemes_no_space), language=None)
-                        st.caption(f"Target ({len(result.get('correct_phonemes_normalized', correct_phonemes_no_space))} chars)")
-                    with col_b:
-                        st.code(result.get('user_phonemes_normalized', user_phonemes_no_space), language=None)
-                        st.caption(f"Yours ({len(result.get('user_phonemes_normalized', user_phonemes_no_space))} chars)")
-                    
-                    # Visual comparison
-                    target_norm = result.get('correct_phonemes_normalized', correct_phonemes_no_space)
-                    user_norm = result.get('user_phonemes_normalized', user_phonemes_no_space)
-                    
-                    if target_norm == user_norm:
-                        st.success("🎯 Phonemes are identical!")
-                    else:
-                        # Use edit distance operations for accurate difference analysis
-                        operations = get_edit_operations(target_norm, user_norm)
-                        
-                        # Count operation types
-                        matches = sum(1 for op in operations if op[0] == 'match')
-                        substitutions = [op for op in operations if op[0] == 'substitute']
-                        insertions = [op for op in operations if op[0] == 'insert']
-                        deletions = [op for op in operations if op[0] == 'delete']
-                        
-                        st.info(f"📊 {matches} matches, {len(substitutions)} substitutions, {len(insertions)} insertions, {len(deletions)} deletions")
-                        
-                        # Show the actual differences (limit to first 5 non-matches)
-                        diffs = []
-                        for op_type, pos, c1, c2 in operations:
-                            if op_type == 'substitute':
-                                diffs.append(f"Position {pos}: `{c1}` → `{c2}` (substitute)")
-                            elif op_type == 'insert':
-                                diffs.append(f"Position {pos}: inserted `{c2}`")
-                            elif op_type == 'delete':
-                                diffs.append(f"Position {pos}: deleted `{c1}`")
-                            
-                            if len(diffs) >= 5:
-                                break
-                        
-                        if diffs:
-                            st.write("**Key differences (first 5):**")
-                            for diff in diffs:
-                                st.write(f"• {diff}")
-                        
-                        if len(substitutions) + len(insertions) + len(deletions) > 5:
-                            st.caption(f"... and {len(substitutions) + len(insertions) + len(deletions) - 5} more differences")
-                
-                # Show your recording directly
-                if result.get('user_audio_bytes'):
-                    st.write("🔊 **Your recording:**")
-                    st.audio(result['user_audio_bytes'], format='audio/wav')
-                
-                # Show TTS of what was recognized (if different)
-                if result['recognized'] != result['target']:
-                    st.write("🔊 **Recognized text (TTS):**")
-                    audio_bytes = speak_text_gtts(result['recognized'], st.session_state.settings['voice'])
-                    st.audio(audio_bytes, format='audio/mp3')
-            
-            # Optional: Hear eSpeak phoneme pronunciation (local development only)
-            if IS_LOCAL_DEV and not result["exact_match"]:
-                st.markdown("---")
-                st.subheader("Compare Phoneme Sounds (eSpeak)")
-                st.caption("🔧 Development feature - requires local audio device")
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("🔊 Correct Phonemes", key="phoneme_correct"):
-                        speak_text(result['target'], 
-                                 voice=st.session_state.settings['voice'],
-                                 speed=st.session_state.settings['speed'],
-                                 pitch=st.session_state.settings['pitch'])
-                with col2:
-                    if st.button("🔊 Your Phonemes", key="phoneme_yours"):
-                        speak_text(result['recognized'],
-                                 voice=st.session_state.settings['voice'],
-                                 speed=st.session_state.settings['speed'],
-                                 pitch=st.session_state.settings['pitch'])
+            render_results(st.session_state.last_result)
     
     # Tab 2: Statistics
     with tab2:
@@ -1081,8 +1497,7 @@ def main():
         if st.session_state.current_session["practices"]:
             st.subheader("🔵 Current Session")
             practices = st.session_state.current_session["practices"]
-            perfect = sum(1 for p in practices if p.get("exact_match", False))
-            avg_sim = sum(p["similarity"] for p in practices) / len(practices)
+            perfect, avg_sim = session_summary(st.session_state.current_session)
             
             col1, col2, col3 = st.columns(3)
             col1.metric("Practices", len(practices))
@@ -1090,30 +1505,22 @@ def main():
             col3.metric("Avg Similarity", f"{avg_sim:.1%}")
         
         # Overall stats
-        if st.session_state.history:
+        # Read from the running totals instead of scanning the whole history
+        stats = st.session_state.stats
+        if stats["n_sessions"]:
             st.subheader("📈 All Time")
             
-            total_practices = sum(len(s["practices"]) for s in st.session_state.history)
-            total_perfect = sum(
-                sum(1 for p in s["practices"] if p.get("match", False))
-                for s in st.session_state.history
-            )
-            
-            all_similarities = [
-                p["similarity"]
-                for s in st.session_state.history
-                for p in s["practices"]
-                if "similarity" in p
-            ]
+            total_practices = stats["total_practices"]
+            total_perfect = stats["total_perfect"]
             
-            if all_similarities:
-                avg_all = sum(all_similarities) / len(all_similarities)
+            if total_practices:
+                avg_all = stats["sum_similarity"] / total_practices
                 
                 col1, col2, col3, col4 = st.columns(4)
                 col1.metric("Total Practices", total_practices)
                 col2.metric("Total Perfect", f"{total_perfect} ({total_perfect/total_practices:.1%})")
                 col3.metric("Overall Avg", f"{avg_all:.1%}")
-                col4.metric("Sessions", len(st.session_state.history))
+                col4.metric("Sessions", stats["n_sessions"])
         else:
             st.info("No practice history yet. Start practicing!")
     
@@ -1124,16 +1531,20 @@ def main():
         if not st.session_state.history:
             st.info("No previous sessions")
         else:
-            for i, session in enumerate(reversed(st.session_state.history[-10:]), 1):
+            for i, session in enumerate(reversed(st.session_state.history[-RECENT_SESSIONS:]), 1):
                 date = session["date"][:10]
                 count = len(session["practices"])
-                perfect = sum(1 for p in session["practices"] if p.get("match", False))
+                perfect, _ = session_summary(session)
                 
                 with st.expander(f"{date} - {count} practices ({perfect} perfect)"):
                     for j, practice in enumerate(session["practices"], 1):
-                        status = "✅" if practice.get("match", False) else f"📊 {practice.get('similarity', 0):.1%}"
+                        if practice.get("exact_match", practice.get("match", False)):
+                            # Expander bodies always run: keep perfect attempts to one
+                            # element, their phonemes are the target's
+                            st.markdown(f"**{j}. ✅** {practice.get('target', 'N/A')} → {practice.get('recognized', 'N/A')}")
+                            continue
                         
-                        st.markdown(f"**{j}. {status}**")
+                        st.markdown(f"**{j}. 📊 {practice.get('similarity', 0):.1%}**")
                         col1, col2 = st.columns(2)
                         
                         with col1:
@@ -4,18 +4,60 @@ Quick test for Google Cloud TTS REST API implementation
 """
 import requests
 import json
-import base64
+import binascii
+import re
 from pathlib import Path
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    import tomli as tomllib
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One pooled session so repeated synthesize calls reuse the TLS connection
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 503], allowed_methods=None),
+))
+
+# Start of the base64 value in {"audioContent": "..."}
+AUDIO_CONTENT_START = re.compile(rb'"audioContent"\s*:\s*"')
+
+
+def write_audio_content(response, out) -> int:
+    """Decode the audioContent field into `out` as the response streams in"""
+    buffer = b""
+    in_audio = False
+    written = 0
+    for chunk in response.iter_content(chunk_size=8192):
+        buffer += chunk
+        if not in_audio:
+            start = AUDIO_CONTENT_START.search(buffer)
+            if not start:
+                continue
+            buffer = buffer[start.end():]
+            in_audio = True
+        end = buffer.find(b'"')
+        data = buffer if end < 0 else buffer[:end]
+        # base64 decodes in 4-character groups; keep the remainder for the next chunk
+        aligned = len(data) - len(data) % 4
+        written += out.write(binascii.a2b_base64(data[:aligned]))
+        buffer = data[aligned:]
+        if end >= 0:
+            break
+    return written
 
 # Read API key from secrets
 secrets_file = Path(".streamlit/secrets.toml")
 if secrets_file.exists():
-    content = secrets_file.read_text()
-    # Simple parsing - look for the API key line
-    for line in content.split('\n'):
-        if 'google_cloud_tts_api_key' in line:
-            api_key = line.split('=')[1].strip().strip('"')
-            break
+    with secrets_file.open("rb") as f:
+        secrets = tomllib.load(f)
+    api_key = secrets.get("google_cloud_tts_api_key")
+    if not api_key:
+        print("❌ google_cloud_tts_api_key not found in .streamlit/secrets.toml")
+        exit(1)
 else:
     print("❌ No .streamlit/secrets.toml found")
     exit(1)
@@ -46,22 +88,18 @@ print(f"   URL: {url}")
 print(f"   Text: {payload['input']['text']}")
 print(f"   Voice: {payload['voice']['name']}")
 
-response = requests.post(url, headers=headers, json=payload)
-
-print(f"\n📊 Response status: {response.status_code}")
-
-if response.status_code == 200:
-    print("✅ SUCCESS! API call worked")
-    response_data = response.json()
-    audio_content_base64 = response_data.get("audioContent", "")
-    audio_bytes = base64.b64decode(audio_content_base64)
-    print(f"   Audio size: {len(audio_bytes)} bytes")
+with SESSION.post(url, headers=headers, json=payload, stream=True, timeout=(3.05, 30)) as response:
+    print(f"\n📊 Response status: {response.status_code}")
     
-    # Save test file
-    test_file = Path("test_google_cloud_tts.mp3")
-    test_file.write_bytes(audio_bytes)
-    print(f"   Saved to: {test_file}")
-    print("\n🎵 Play the file to verify audio quality!")
-else:
-    print(f"❌ FAILED!")
-    print(f"   Error: {response.text[:500]}")
+    if response.status_code == 200:
+        print("✅ SUCCESS! API call worked")
+        # Save test file, decoding the audio as it arrives instead of buffering the whole JSON
+        test_file = Path("test_google_cloud_tts.mp3")
+        with test_file.open("wb") as f:
+            audio_size = write_audio_content(response, f)
+        print(f"   Audio size: {audio_size} bytes")
+        print(f"   Saved to: {test_file}")
+        print("\n🎵 Play the file to verify audio quality!")
+    else:
+        print(f"❌ FAILED!")
+        print(f"   Error: {response.text[:500]}")
@@ -3,7 +3,9 @@
 Simple gTTS test - check if Google TTS is working or rate-limited
 """
 from gtts import gTTS
+import asyncio
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 print("🧪 Testing gTTS (unofficial Google TTS API)...")
@@ -14,10 +16,9 @@ test_phrases = [
     ("Bonjour, comment allez-vous?", "fr"),
 ]
 
-for i, (text, lang) in enumerate(test_phrases, 1):
-    print(f"\nTest {i}: {text} ({lang})")
-    print("-" * 60)
-    
+
+def synthesize(text: str, lang: str):
+    """Generate one phrase; returns the MP3 size, or the exception raised"""
     try:
         # Attempt to generate speech
         tts = gTTS(text=text, lang=lang, slow=False)
@@ -29,12 +30,33 @@ for i, (text, lang) in enumerate(test_phrases, 1):
             
             # Check file size
             file_size = Path(mp3_path).stat().st_size
-            print(f"✅ SUCCESS! Generated {file_size} bytes")
             
             # Clean up
             Path(mp3_path).unlink()
-            
+        return file_size
     except Exception as e:
+        return e
+
+
+async def synthesize_all(phrases):
+    """Run the blocking gTTS calls side by side, so the run takes the slowest request, not the sum"""
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=len(phrases)) as executor:
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, synthesize, text, lang) for text, lang in phrases)
+        )
+
+
+results = asyncio.run(synthesize_all(test_phrases))
+
+for i, ((text, lang), result) in enumerate(zip(test_phrases, results), 1):
+    print(f"\nTest {i}: {text} ({lang})")
+    print("-" * 60)
+    
+    if not isinstance(result, Exception):
+        print(f"✅ SUCCESS! Generated {result} bytes")
+    else:
+        e = result
         print(f"❌ FAILED: {type(e).__name__}")
         print(f"   Error message: {str(e)[:200]}")
         
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Cross-app check of the shared practice history files.
+
+app.py, streamlit_app.py and streamlit_app_v2.py all append to
+practice_history.jsonl and keep practice_stats.json up to date, so a session
+written by one app must load in the others.
+
+Run with: python test_history_schema.py  (or python -m pytest test_history_schema.py)
+"""
+import ast
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+import orjson
+import streamlit as st
+
+import streamlit_app
+import streamlit_app_v2
+
+APP_FILE = Path(__file__).resolve().with_name("app.py")
+APP_HISTORY_NAMES = {"HISTORY_FILE", "STATS_FILE", "session_summary", "update_stats_file", "save_history"}
+
+
+def load_app_history_writer() -> Dict:
+    """app.py logs in at import time, so compile just its history writer"""
+    tree = ast.parse(APP_FILE.read_text(encoding="utf-8"))
+    nodes = [
+        node for node in tree.body
+        if (isinstance(node, ast.FunctionDef) and node.name in APP_HISTORY_NAMES)
+        or (isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id in APP_HISTORY_NAMES for t in node.targets))
+    ]
+    namespace = {"orjson": orjson, "os": os, "threading": threading, "Path": Path, "Dict": Dict, "st": st}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(APP_FILE), "exec"), namespace)
+    return namespace
+
+
+app = load_app_history_writer()
+
+
+@contextmanager
+def history_dir():
+    """Run with empty history files (all apps use paths relative to the cwd)"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            streamlit_app.load_recent_sessions.clear()
+            yield Path(tmp)
+        finally:
+            os.chdir(cwd)
+
+
+def app_session() -> Dict:
+    """A session as app.py builds it: practices carry exact_match, not match"""
+    return {
+        "date": "2025-11-14T10:00:00",
+        "practices": [
+            {"target": "isso", "recognized": "isso", "exact_match": True, "similarity": 1.0},
+            {"target": "casa", "recognized": "causa", "exact_match": False, "similarity": 0.5},
+        ],
+    }
+
+
+def streamlit_app_session() -> Dict:
+    """A session as streamlit_app.py builds it, with its inline aggregates"""
+    session = {
+        "date": "2025-11-15T10:00:00",
+        "practices": [
+            {"target": "obrigado", "recognized": "obrigado", "match": True, "similarity": 1.0},
+        ],
+    }
+    session["_perfect"], session["_avg_sim"] = streamlit_app.session_summary(session)
+    return session
+
+
+def test_app_session_loads_in_other_apps():
+    with history_dir():
+        app["save_history"](app_session())
+
+        # No practice_stats.json yet: both apps rebuild the totals from the history
+        for module in (streamlit_app, streamlit_app_v2):
+            stats = module.load_stats()
+            assert stats["n_sessions"] == 1
+            assert stats["total_practices"] == 2
+            assert stats["total_perfect"] == 1
+            assert abs(stats["sum_similarity"] - 1.5) < 1e-9
+
+        sessions = streamlit_app.load_recent_sessions(1)
+        assert streamlit_app.session_summary(sessions[0]) == (1, 0.75)
+        sessions = streamlit_app_v2.load_history()
+        assert streamlit_app_v2.session_summary(sessions[0]) == (1, 0.75)
+
+
+def test_sessions_without_aggregates_load():
+    # Lines saved before app.py stored _perfect/_avg_sim, one practice unscored
+    legacy = app_session()
+    legacy["practices"].append({"target": "sim", "recognized": "", "exact_match": False})
+    with history_dir():
+        Path("practice_history.jsonl").write_bytes(orjson.dumps(legacy) + b"\n")
+
+        stats = streamlit_app.load_stats()
+        assert stats["n_sessions"] == 1
+        assert stats["total_perfect"] == 1
+        assert streamlit_app.session_summary(streamlit_app.load_recent_sessions(1)[0]) == (1, 0.75)
+        assert streamlit_app_v2.load_stats()["total_perfect"] == 1
+
+
+def test_running_totals_agree_across_apps():
+    with history_dir():
+        stats = streamlit_app.load_stats()
+        streamlit_app.append_history(streamlit_app_session(), stats)
+        app["save_history"](app_session())
+        streamlit_app_v2.save_history(streamlit_app_session(), streamlit_app_v2.load_stats())
+
+        # The incrementally kept totals match a rebuild from the history
+        kept = orjson.loads(Path("practice_stats.json").read_bytes())
+        os.remove("practice_stats.json")
+        rebuilt = streamlit_app.load_stats()
+        assert kept["n_sessions"] == rebuilt["n_sessions"] == 3
+        assert kept["total_practices"] == rebuilt["total_practices"] == 4
+        assert kept["total_perfect"] == rebuilt["total_perfect"] == 3
+        assert abs(kept["sum_similarity"] - rebuilt["sum_similarity"]) < 1e-9
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
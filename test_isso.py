@@ -4,6 +4,9 @@ Quick test for "isso" recognition with various strategies
 """
 import sys
 import warnings
+from functools import lru_cache
+
+import numpy as np
 
 # Suppress FP16 warning from Whisper on CPU
 warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
@@ -11,6 +14,11 @@ warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
 sys.path.insert(0, '.')
 from pronunciation_trainer import PronunciationTrainer
 
+# Decode settings shared by the warm-up and every attempt
+PROMPT = "isso"
+TEMPERATURE = 0.0
+SAMPLE_RATE = 16000
+
 print("=" * 70)
 print("Testing 'isso' recognition")
 print("=" * 70)
@@ -29,6 +37,19 @@ print()
 
 trainer = PronunciationTrainer(voice='pt-br')
 
+# Decode 0.1 s of silence now, so lazy init (kernels, tokenizer, VAD) happens
+# before the first prompt instead of inside attempt 1
+print("Warming up Whisper...")
+trainer.transcribe_audio(np.zeros(1600, dtype=np.float32), prompt=PROMPT, temperature=TEMPERATURE)
+
+# One 2 second buffer shared by every attempt (shorter = less hallucination)
+audio_buf = np.empty((int(2.0 * SAMPLE_RATE), 1), dtype=np.float32)
+
+# The target never changes and Whisper often repeats itself across attempts,
+# so look each text up in eSpeak only once
+get_phonemes = lru_cache(maxsize=256)(trainer.get_phonemes)
+correct_phonemes = get_phonemes("isso")
+
 for attempt in range(3):
     print(f"\n{'=' * 70}")
     print(f"Attempt {attempt + 1}/3")
@@ -36,19 +57,18 @@ for attempt in range(3):
     
     input("Press Enter when ready, then speak 'isso'...")
     
-    # Record with shorter duration
-    audio_file = trainer.record_audio(duration=2.0)
+    # Record into the shared buffer and transcribe it directly, no WAV round-trip
+    trainer.record_audio(samplerate=SAMPLE_RATE, out=audio_buf)
     
     # Transcribe with prompting
     recognized, result = trainer.transcribe_audio(
-        audio_file,
-        prompt="isso",
-        temperature=0.0
+        audio_buf[:, 0],
+        prompt=PROMPT,
+        temperature=TEMPERATURE
     )
     
     # Check what we got
-    correct_phonemes = trainer.get_phonemes("isso")
-    user_phonemes = trainer.get_phonemes(recognized)
+    user_phonemes = get_phonemes(recognized)
     
     print(f"Target phonemes:     {correct_phonemes}")
     print(f"Recognized text:     {recognized}")
@@ -7,29 +7,71 @@ Usage:
     python3 update_version.py 1.2.3 --date "14 November 2025"
 """
 
+import os
 import sys
 import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-def update_version_in_file(file_path, old_pattern, new_value, description):
-    """Update version pattern in a file."""
+APP_VERSION = re.compile(r'__version__\s*=\s*["\'][0-9]+\.[0-9]+\.[0-9]+["\']')
+# Badge and "| Last Updated:" lines in one pass; group 1 is set only where a date follows
+VERSION_LINE = re.compile(r'\*\*Version\s+[0-9]+\.[0-9]+\.[0-9]+\*\*(\s*\|\s*Last Updated:.*)?')
+
+# Documentation files carrying a **Version X.Y.Z** line, relative to the project root
+DOC_FILES = [
+    Path("README.md"),
+    Path("app-docs") / "README.md",
+    Path("app-docs") / "DEVELOPER_GUIDE.md",
+    Path("app-docs") / "TESTING_GUIDE.md",
+    Path("app-docs") / "USER_GUIDE.md",
+]
+
+def read_file(file_path):
+    """Read a file, returning the exception instead of raising it."""
     try:
-        content = file_path.read_text(encoding='utf-8')
-        
-        # Try to find and replace the pattern
-        new_content, count = re.subn(old_pattern, new_value, content)
-        
-        if count > 0:
-            file_path.write_text(new_content, encoding='utf-8')
-            print(f"✓ {file_path.name}: {description} ({count} replacement(s))")
-            return True
-        else:
-            print(f"⚠ {file_path.name}: Pattern not found - {description}")
-            return False
+        return file_path.read_text(encoding='utf-8')
     except Exception as e:
-        print(f"✗ {file_path.name}: Error - {e}")
-        return False
+        return e
+
+def write_file(file_path, content):
+    """Atomically replace a file, returning the exception instead of raising it."""
+    tmp_path = None
+    try:
+        # Write beside the target and rename over it, so a crash never leaves a half-written file
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=file_path.parent,
+                                         prefix=f".{file_path.name}.", delete=False) as tmp:
+            tmp_path = tmp.name
+            tmp.write(content)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except Exception as e:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return e
+
+def update_version_in_content(file_path, content, pattern, new_value, description):
+    """Apply a version pattern to a file's content; returns the new content, or None if not found."""
+    if isinstance(content, Exception):
+        print(f"✗ {file_path.name}: Error - {content}")
+        return None
+    
+    # Try to find and replace the pattern
+    new_content, count = pattern.subn(new_value, content)
+    
+    if count > 0 and new_content == content:
+        print(f"= {file_path.name}: Already up-to-date - {description}")
+        return content
+    elif count > 0:
+        print(f"✓ {file_path.name}: {description} ({count} replacement(s))")
+        return new_content
+    else:
+        print(f"⚠ {file_path.name}: Pattern not found - {description}")
+        return None
 
 def main():
     if len(sys.argv) < 2:
@@ -59,74 +101,43 @@ def main():
     print(f"Update date: {update_date}")
     print("-" * 50)
     
-    success_count = 0
-    total_count = 0
-    
-    # 1. Update app.py - __version__ variable
-    app_file = script_dir / "app.py"
-    total_count += 1
-    if update_version_in_file(
-        app_file,
-        r'__version__\s*=\s*["\'][0-9]+\.[0-9]+\.[0-9]+["\']',
-        f'__version__ = "{new_version}"',
-        f"__version__ = \"{new_version}\""
-    ):
-        success_count += 1
-    
-    # 2. Update README.md - Version line
-    readme_file = script_dir / "README.md"
-    total_count += 1
-    if update_version_in_file(
-        readme_file,
-        r'\*\*Version\s+[0-9]+\.[0-9]+\.[0-9]+\*\*',
-        f'**Version {new_version}**',
-        f"Version badge"
-    ):
-        success_count += 1
+    def replace_version_line(match):
+        if match.group(1):
+            return f'**Version {new_version}** | Last Updated: {update_date}'
+        return f'**Version {new_version}**'
     
-    # 3. Update app-docs/README.md - Version and date
-    app_docs_readme = script_dir / "app-docs" / "README.md"
-    total_count += 1
-    if update_version_in_file(
-        app_docs_readme,
-        r'\*\*Version\s+[0-9]+\.[0-9]+\.[0-9]+\*\*\s*\|\s*Last Updated:.*',
-        f'**Version {new_version}** | Last Updated: {update_date}',
-        f"Version and date"
-    ):
-        success_count += 1
+    # (file, pattern, replacement, description)
+    version_updates = [
+        (script_dir / "app.py", APP_VERSION, f'__version__ = "{new_version}"', f"__version__ = \"{new_version}\""),
+    ] + [
+        (script_dir / doc_file, VERSION_LINE, replace_version_line, "Version line")
+        for doc_file in DOC_FILES
+    ]
+    paths = [file_path for file_path, *_ in version_updates]
+    total_count = len(paths)
     
-    # 4. Update app-docs/DEVELOPER_GUIDE.md - Version and date
-    dev_guide = script_dir / "app-docs" / "DEVELOPER_GUIDE.md"
-    total_count += 1
-    if update_version_in_file(
-        dev_guide,
-        r'\*\*Version\s+[0-9]+\.[0-9]+\.[0-9]+\*\*\s*\|\s*Last Updated:.*',
-        f'**Version {new_version}** | Last Updated: {update_date}',
-        f"Version and date"
-    ):
-        success_count += 1
-    
-    # 5. Update app-docs/TESTING_GUIDE.md - Version at top
-    testing_guide = script_dir / "app-docs" / "TESTING_GUIDE.md"
-    total_count += 1
-    if update_version_in_file(
-        testing_guide,
-        r'\*\*Version\s+[0-9]+\.[0-9]+\.[0-9]+\*\*',
-        f'**Version {new_version}**',
-        f"Version badge"
-    ):
-        success_count += 1
+    # The files are independent: read them together, substitute here, write them together
+    with ThreadPoolExecutor(max_workers=total_count) as executor:
+        contents = list(executor.map(read_file, paths))
+        
+        updated = []
+        up_to_date_count = 0
+        for content, (file_path, pattern, new_value, description) in zip(contents, version_updates):
+            new_content = update_version_in_content(file_path, content, pattern, new_value, description)
+            if new_content is content:
+                # Nothing changed: skip the write and leave the mtime alone
+                up_to_date_count += 1
+            elif new_content is not None:
+                updated.append((file_path, new_content))
+        
+        errors = list(executor.map(lambda update: write_file(*update), updated))
     
-    # 6. Update app-docs/USER_GUIDE.md - Version and date
-    user_guide = script_dir / "app-docs" / "USER_GUIDE.md"
-    total_count += 1
-    if update_version_in_file(
-        user_guide,
-        r'\*\*Version\s+[0-9]+\.[0-9]+\.[0-9]+\*\*\s*\|\s*Last Updated:.*',
-        f'**Version {new_version}** | Last Updated: {update_date}',
-        f"Version and date"
-    ):
-        success_count += 1
+    success_count = up_to_date_count
+    for (file_path, _), error in zip(updated, errors):
+        if error is None:
+            success_count += 1
+        else:
+            print(f"✗ {file_path.name}: Error - {error}")
     
     print("-" * 50)
     print(f"Updated {success_count}/{total_count} files successfully")